@@ -6,7 +6,8 @@ CLI tool for managing agent configuration backups.
 import sys
 import os
 import argparse
-from datetime import datetime
+import itertools
+import operator
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
@@ -19,6 +20,11 @@ from core.backup_utils import (
 )
 
 
+def _fmt_iso(iso_time):
+    """Format an ISO timestamp (YYYY-MM-DDTHH:MM:SS...) as 'YYYY-MM-DD HH:MM:SS'."""
+    return iso_time[:10] + " " + iso_time[11:19]
+
+
 def backup_agent(args):
     """Backup a specific agent."""
     backup_path = backup_agent_config(args.agent_name, args.agents_dir, args.reason or "manual")
@@ -57,17 +63,17 @@ def list_all_backups(args):
     print(f"Found {len(backups)} backup(s):")
     print()
     
-    current_agent = None
-    for backup in backups:
-        if backup['agent_name'] != current_agent:
-            if current_agent is not None:
-                print()
-            current_agent = backup['agent_name']
-            print(f"Agent: {backup['agent_name']}")
-            print("-" * (len(backup['agent_name']) + 7))
+    # Stable sort keeps the newest-first order within each agent
+    by_agent = sorted(backups, key=operator.itemgetter('agent_name'))
+    for index, (agent_name, agent_backups) in enumerate(
+            itertools.groupby(by_agent, key=operator.itemgetter('agent_name'))):
+        if index:
+            print()
+        print(f"Agent: {agent_name}")
+        print("-" * (len(agent_name) + 7))
         
-        created_time = datetime.fromisoformat(backup['created_time']).strftime("%Y-%m-%d %H:%M:%S")
-        print(f"  {backup['filename']} (reason: {backup['reason']}, created: {created_time})")
+        for backup in agent_backups:
+            print(f"  {backup['filename']} (reason: {backup['reason']}, created: {_fmt_iso(backup['created_time'])})")
 
 
 def restore_backup(args):
@@ -8,25 +8,66 @@ from google.adk.agents import Agent
 
 logger = logging.getLogger(__name__)
 
+_REQUIRED_KEYS = frozenset({"name", "description", "instruction"})
+_WARNING_KEYS = frozenset({"model"})
+
+
 def _validate_agent_config(config) -> bool:
-    required_keys = ["name", "description", "instruction"]
-    for key in required_keys:
-        if key not in config:
-            logger.error(f"Missing required config key: {key}")
-            return False, f'Missing required config key: {key}'
-
-    warning_keys = ["model"]
-    for key in warning_keys:
-        if key not in config:
-            logger.warning(f"Key {key} is not present in the config. Will use default value.")
+    keys = config.keys()
+    missing_keys = _REQUIRED_KEYS - keys
+    if missing_keys:
+        key = min(missing_keys)
+        logger.error("Missing required config key: %s", key)
+        return False, f'Missing required config key: {key}'
+
+    for key in _WARNING_KEYS - keys:
+        logger.warning("Key %s is not present in the config. Will use default value.", key)
             
     return True, ""
 
 
+def _resolve_tools(config, tools_registry: ToolRegistry) -> dict:
+    """
+    Validate every agent in the hierarchy and create one instance per referenced tool.
+
+    Args:
+        config: Root agent configuration dictionary.
+        tools_registry: Plugin registry instance.
+
+    Returns:
+        Mapping of tool name to tool instance (None for tools missing from the registry).
+    """
+    tool_instances = {}
+    stack = [config]
+    while stack:
+        node = stack.pop()
+        is_config_valid, error_message = _validate_agent_config(node)
+        if not is_config_valid:
+            raise ValueError(f"Invalid agent configuration: {error_message}")
+
+        for tool_name in node.get("tools") or ():
+            if tool_name in tool_instances:
+                continue
+            tool = tools_registry.get_tool(tool_name)
+            if tool:
+                tool_instances[tool_name] = tool.create_instance()
+            else:
+                logger.warning(f"Tool '{tool_name}' not found in registry.")
+                tool_instances[tool_name] = None
+
+        stack.extend((node.get("sub_agents") or {}).values())
+
+    return tool_instances
+
+
 def create_agent(config, tools_registry: ToolRegistry) -> Agent:
     """
     Create a simple AI agent with the given configuration and tools registry.
 
+    The agent hierarchy is built iteratively in post-order so that sub-agents
+    are constructed before their parents, and tool instances are shared
+    between agents referencing the same tool.
+
     Args:
         config: Agent configuration dictionary.
         tools_registry: Plugin registry instance.
@@ -34,26 +75,38 @@ def create_agent(config, tools_registry: ToolRegistry) -> Agent:
     Returns:
         An instance of SimpleAgent.
     """
-    is_config_valid, error_message = _validate_agent_config(config)
-    if not is_config_valid:
-        raise ValueError(f"Invalid agent configuration: {error_message}")
-
-    tools = []
-    for tool_name in config.get("tools", []):
-        tool = tools_registry.get_tool(tool_name)
-        if tool:
-            tools.append(tool.create_instance())
-        else:
-            logger.warning(f"Tool '{tool_name}' not found in registry.")
-
-    sub_agents = []
-    for sub_agent_config in config.get("sub_agents", {}).values():
-        sub_agents.append(create_agent(sub_agent_config, tools_registry))
-
-    return Agent(
-        name=config["name"],
-        model=config.get("model", "gemini-2.0-flash"),
-        description=config.get("description", ""),
-        instruction=config.get("instruction", ""),
-        sub_agents=sub_agents,
-        tools=tools)
\ No newline at end of file
+    tool_instances = _resolve_tools(config, tools_registry)
+
+    built_agents = []
+    stack = [(config, False)]
+    while stack:
+        node, expanded = stack.pop()
+        sub_agent_configs = (node.get("sub_agents") or {}).values()
+        if not expanded:
+            stack.append((node, True))
+            stack.extend((sub_config, False) for sub_config in reversed(sub_agent_configs))
+            continue
+
+        # Children were appended to built_agents in order just before this node
+        first_child = len(built_agents) - len(sub_agent_configs)
+        sub_agents = built_agents[first_child:]
+        del built_agents[first_child:]
+
+        name = node["name"]
+        tool_names = node.get("tools") or ()
+        model = node.get("model", "gemini-2.0-flash")
+        description = node.get("description", "")
+        instruction = node.get("instruction", "")
+
+        tools = [tool_instances[tool_name] for tool_name in tool_names
+                 if tool_instances[tool_name] is not None]
+
+        built_agents.append(Agent(
+            name=name,
+            model=model,
+            description=description,
+            instruction=instruction,
+            sub_agents=sub_agents,
+            tools=tools))
+
+    return built_agents[0]
@@ -4,8 +4,12 @@ This module provides backup functionality for agent configurations.
 """
 
 import os
-from fastapi import FastAPI, HTTPException, Request
-from typing import Dict, Any
+import asyncio
+import itertools
+import operator
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+from typing import Dict, Any, Optional
 from google.adk.cli.utils.agent_loader import AgentLoader
 
 from .backup_utils import (
@@ -16,6 +20,10 @@ from .backup_utils import (
     cleanup_old_backups
 )
 
+class RestoreRequest(BaseModel):
+    """Request model for restoring an agent from a backup."""
+    backup_filename: str
+
 
 def enhance_app_with_backup_endpoints(app: FastAPI, agent_loader: AgentLoader) -> FastAPI:
     """
@@ -37,7 +45,7 @@ def enhance_app_with_backup_endpoints(app: FastAPI, agent_loader: AgentLoader) -
     async def backup_all_agent_configs() -> Dict[str, Any]:
         """Create backups for all agent configurations."""
         try:
-            backup_paths = backup_all_agents(agent_loader.agents_dir, "manual_backup")
+            backup_paths = await asyncio.to_thread(backup_all_agents, agent_loader.agents_dir, "manual_backup")
             return {
                 "message": f"Created {len(backup_paths)} backups",
                 "backups": backup_paths,
@@ -53,8 +61,7 @@ def enhance_app_with_backup_endpoints(app: FastAPI, agent_loader: AgentLoader) -
     )
     async def backup_agent(agent_name: str) -> Dict[str, Any]:
         """Create backup for a specific agent configuration."""
-        agents_list = list(agent_loader.list_agents())
-        if agent_name not in agents_list:
+        if agent_name not in await asyncio.to_thread(agent_loader.list_agents_set):
             raise HTTPException(status_code=404, detail="Agent not found")
         
         try:
@@ -76,10 +83,13 @@ def enhance_app_with_backup_endpoints(app: FastAPI, agent_loader: AgentLoader) -
         tags=["backup"],
         summary="List all available backups"
     )
-    async def get_all_backups() -> Dict[str, Any]:
-        """List all available backups."""
+    async def get_all_backups(limit: Optional[int] = None, offset: int = 0) -> Dict[str, Any]:
+        """List all available backups, newest first, optionally paginated."""
+        if offset < 0 or (limit is not None and limit < 0):
+            raise HTTPException(status_code=400, detail="limit and offset must not be negative")
+        
         try:
-            backups = list_backups(agent_loader.agents_dir)
+            backups = list_backups(agent_loader.agents_dir, limit=limit, offset=offset)
             return {
                 "backups": backups,
                 "count": len(backups),
@@ -93,10 +103,13 @@ def enhance_app_with_backup_endpoints(app: FastAPI, agent_loader: AgentLoader) -
         tags=["backup"],
         summary="List backups for specific agent"
     )
-    async def get_agent_backups(agent_name: str) -> Dict[str, Any]:
-        """List backups for a specific agent."""
+    async def get_agent_backups(agent_name: str, limit: Optional[int] = None, offset: int = 0) -> Dict[str, Any]:
+        """List backups for a specific agent, newest first, optionally paginated."""
+        if offset < 0 or (limit is not None and limit < 0):
+            raise HTTPException(status_code=400, detail="limit and offset must not be negative")
+        
         try:
-            backups = list_backups(agent_loader.agents_dir, agent_name)
+            backups = list_backups(agent_loader.agents_dir, agent_name, limit=limit, offset=offset)
             return {
                 "agent_name": agent_name,
                 "backups": backups,
@@ -111,20 +124,26 @@ def enhance_app_with_backup_endpoints(app: FastAPI, agent_loader: AgentLoader) -
         tags=["backup"],
         summary="Restore agent from backup"
     )
-    async def restore_agent(agent_name: str, request: Request) -> Dict[str, Any]:
+    async def restore_agent(agent_name: str, request: RestoreRequest) -> Dict[str, Any]:
         """Restore agent from a backup."""
         try:
-            data = await request.json()
-            backup_filename = data.get("backup_filename")
+            backup_filename = request.backup_filename
             if not backup_filename:
                 raise HTTPException(status_code=400, detail="backup_filename is required")
             
+            # restore_agent_from_backup writes the agent named in the backup filename
+            if os.path.basename(backup_filename).split("_", 1)[0] != agent_name:
+                raise HTTPException(status_code=400, detail=f"Backup {backup_filename} does not belong to agent {agent_name}")
+            
             backup_filepath = os.path.join(agent_loader.agents_dir, "backups", backup_filename)
             
-            if not os.path.exists(backup_filepath):
+            # File checks and the copy run in a worker thread to keep the event loop free
+            if not await asyncio.to_thread(os.path.exists, backup_filepath):
                 raise HTTPException(status_code=404, detail="Backup file not found")
             
-            if restore_agent_from_backup(backup_filepath, agent_loader.agents_dir):
+            if await asyncio.to_thread(restore_agent_from_backup, backup_filepath, agent_loader.agents_dir):
+                # The restored file keeps the backup's mtime, so drop the cached copies explicitly
+                agent_loader.invalidate_agent(agent_name)
                 return {
                     "message": f"Agent {agent_name} restored from backup {backup_filename}",
                     "agent_name": agent_name,
@@ -171,37 +190,19 @@ def enhance_app_with_backup_endpoints(app: FastAPI, agent_loader: AgentLoader) -
         try:
             all_backups = list_backups(agent_loader.agents_dir)
             
-            # Group by agent
+            # Group by agent; sizes were collected during the directory scan
             agent_stats = {}
-            total_size = 0
+            total_size = sum(backup.get("size_bytes", 0) for backup in all_backups)
             
-            for backup in all_backups:
-                agent_name = backup["agent_name"]
-                if agent_name not in agent_stats:
-                    agent_stats[agent_name] = {
-                        "count": 0,
-                        "latest_backup": None,
-                        "oldest_backup": None
-                    }
-                
-                agent_stats[agent_name]["count"] += 1
-                
-                # Update latest/oldest
-                backup_time = backup["created_time"]
-                if (agent_stats[agent_name]["latest_backup"] is None or 
-                    backup_time > agent_stats[agent_name]["latest_backup"]):
-                    agent_stats[agent_name]["latest_backup"] = backup_time
-                
-                if (agent_stats[agent_name]["oldest_backup"] is None or 
-                    backup_time < agent_stats[agent_name]["oldest_backup"]):
-                    agent_stats[agent_name]["oldest_backup"] = backup_time
-                
-                # Calculate file size if possible
-                try:
-                    file_size = os.path.getsize(backup["filepath"])
-                    total_size += file_size
-                except:
-                    pass
+            # Within each agent group backups are ordered oldest to latest
+            by_agent = sorted(all_backups, key=operator.itemgetter("agent_name", "created_time"))
+            for agent_name, group in itertools.groupby(by_agent, key=operator.itemgetter("agent_name")):
+                agent_backups = list(group)
+                agent_stats[agent_name] = {
+                    "count": len(agent_backups),
+                    "latest_backup": agent_backups[-1]["created_time"],
+                    "oldest_backup": agent_backups[0]["created_time"]
+                }
             
             return {
                 "total_backups": len(all_backups),
@@ -1,13 +1,18 @@
 """API tools for exposing tool schemas via FastAPI endpoints."""
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
+from collections import OrderedDict
+import functools
 import importlib
+import json
 import os
 
 import logging
 
+from core.tool_creation.tool_factories import BaseToolFactory
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,17 +27,122 @@ class ToolTestRequest(BaseModel):
     params: Dict[str, Any] = {}
 
 
-def enhance_app_with_tool_schema_endpoints(app: FastAPI) -> FastAPI:
-    """Enhance FastAPI app with tool schema endpoints."""
+@functools.lru_cache(maxsize=256)
+def _import_tool_class(class_path: str):
+    """Dynamically import a tool class from a string path."""
+    try:
+        module_path, class_name = class_path.rsplit('.', 1)
+        module = importlib.import_module(module_path)
+        return getattr(module, class_name)
+    except (ValueError, ImportError, AttributeError) as e:
+        raise ImportError(f"Could not import class '{class_path}': {e}")
+
+
+@functools.lru_cache(maxsize=256)
+def _get_tool_class_schema(tool_class) -> Optional[Tuple[Dict[str, Any], Any]]:
+    """Return the (schema, data_model) pair for a tool class, or None if it has no schema."""
+    # Check if the class has a schema method or data_model
+    if hasattr(tool_class, 'data_model'):
+        # Use the static data_model if available
+        return tool_class.data_model.model_json_schema(), tool_class.data_model
+    if hasattr(tool_class, 'schema'):
+        # Fallback to schema method
+        return tool_class.schema(), None
+    return None
+
+
+def _build_schema_response(class_path: str) -> Dict[str, Any]:
+    """Build the schema endpoint response for a tool class path."""
+    try:
+        # Import the tool class
+        tool_class = _import_tool_class(class_path)
+        
+        class_schema = _get_tool_class_schema(tool_class)
+        if class_schema is None:
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Tool class '{class_path}' does not implement schema() method or data_model attribute"
+            )
+        schema, data_model = class_schema
+        
+        response = {
+            "class_name": class_path,
+            "tool_class": tool_class.__name__,
+            "module": tool_class.__module__,
+            "schema": schema
+        }
+        if data_model is not None:
+            response["data_model"] = data_model.__name__
+            response["data_model_module"] = data_model.__module__
+        return response
+            
+    except HTTPException:
+        raise
+    except ImportError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get tool schema: {str(e)}")
+
+
+# Common tool modules to check
+_TOOL_MODULES = (
+    "core.tool_creation.generic_tools",
+    "tools.semantic_search",
+    "tools.file_tools", 
+    "tools.rally_tools",
+    "tools.oracle_tools",
+    "tools.terminal_tools"
+)
+
+# Tool factories built by /tools/test, reused for identical configurations.
+# Factories are expected to keep no per-call state in _execute, so one
+# instance can serve repeated (and concurrent) test requests.
+_TEST_FACTORY_CACHE_SIZE = 64
+_test_factory_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+
+_available_tools_cache: Optional[Dict[str, Dict[str, Any]]] = None
+
+
+def _scan_available_tools() -> Dict[str, Dict[str, Any]]:
+    """Find tool classes in the known tool modules, caching the result once every module imported."""
+    global _available_tools_cache
+    if _available_tools_cache is not None:
+        return _available_tools_cache
+    
+    available_tools = {}
+    all_imported = True
     
-    def _import_tool_class(class_path: str):
-        """Dynamically import a tool class from a string path."""
+    for module_name in _TOOL_MODULES:
         try:
-            module_path, class_name = class_path.rsplit('.', 1)
-            module = importlib.import_module(module_path)
-            return getattr(module, class_name)
-        except (ValueError, ImportError, AttributeError) as e:
-            raise ImportError(f"Could not import class '{class_path}': {e}")
+            module = importlib.import_module(module_name)
+        except ImportError:
+            # Skip modules that can't be imported, and retry them on the next scan
+            all_imported = False
+            continue
+        
+        # Find classes that have schema method
+        for attr_name, attr in vars(module).items():
+            if not (isinstance(attr, type) and attr_name.endswith(('Tool', 'Tools'))):
+                continue
+            if not (hasattr(attr, 'schema') or hasattr(attr, 'data_model')):
+                continue
+            
+            data_model = getattr(attr, 'data_model', None)
+            class_path = f"{module_name}.{attr_name}"
+            available_tools[class_path] = {
+                "class_name": attr_name,
+                "module": module_name,
+                "has_schema": data_model is not None,
+                "data_model_name": data_model.__name__ if data_model is not None else None
+            }
+    
+    if all_imported:
+        _available_tools_cache = available_tools
+    return available_tools
+
+
+def enhance_app_with_tool_schema_endpoints(app: FastAPI) -> FastAPI:
+    """Enhance FastAPI app with tool schema endpoints."""
     
     @app.post(
         "/tools/schema",
@@ -41,40 +151,7 @@ def enhance_app_with_tool_schema_endpoints(app: FastAPI) -> FastAPI:
     )
     async def get_tool_schema_by_class(request: ToolSchemaRequest) -> Dict[str, Any]:
         """Get tool schema by providing the class name (e.g., 'tools.semantic_search.SemanticSearchTool')."""
-        try:
-            # Import the tool class
-            tool_class = _import_tool_class(request.class_name)
-            
-            # Check if the class has a schema method or data_model
-            if hasattr(tool_class, 'data_model'):
-                # Use the static data_model if available
-                schema = tool_class.data_model.model_json_schema()
-                data_model_info = {
-                    "data_model": tool_class.data_model.__name__,
-                    "data_model_module": tool_class.data_model.__module__
-                }
-            elif hasattr(tool_class, 'schema'):
-                # Fallback to schema method
-                schema = tool_class.schema()
-                data_model_info = {}
-            else:
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"Tool class '{request.class_name}' does not implement schema() method or data_model attribute"
-                )
-            
-            return {
-                "class_name": request.class_name,
-                "tool_class": tool_class.__name__,
-                "module": tool_class.__module__,
-                "schema": schema,
-                **data_model_info
-            }
-                
-        except ImportError as e:
-            raise HTTPException(status_code=404, detail=str(e))
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Failed to get tool schema: {str(e)}")
+        return _build_schema_response(request.class_name)
 
     @app.get(
         "/tools/schema/{class_path:path}",
@@ -83,40 +160,7 @@ def enhance_app_with_tool_schema_endpoints(app: FastAPI) -> FastAPI:
     )
     async def get_tool_schema_by_class_path(class_path: str) -> Dict[str, Any]:
         """Get tool schema by providing the class path in URL (e.g., tools.semantic_search.SemanticSearchTool)."""
-        try:
-            # Import the tool class
-            tool_class = _import_tool_class(class_path)
-            
-            # Check if the class has a schema method or data_model
-            if hasattr(tool_class, 'data_model'):
-                # Use the static data_model if available
-                schema = tool_class.data_model.model_json_schema()
-                data_model_info = {
-                    "data_model": tool_class.data_model.__name__,
-                    "data_model_module": tool_class.data_model.__module__
-                }
-            elif hasattr(tool_class, 'schema'):
-                # Fallback to schema method
-                schema = tool_class.schema()
-                data_model_info = {}
-            else:
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"Tool class '{class_path}' does not implement schema() method or data_model attribute"
-                )
-            
-            return {
-                "class_name": class_path,
-                "tool_class": tool_class.__name__,
-                "module": tool_class.__module__,
-                "schema": schema,
-                **data_model_info
-            }
-                
-        except ImportError as e:
-            raise HTTPException(status_code=404, detail=str(e))
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Failed to get tool schema: {str(e)}")
+        return _build_schema_response(class_path)
 
     @app.get(
         "/tools/available",
@@ -126,40 +170,7 @@ def enhance_app_with_tool_schema_endpoints(app: FastAPI) -> FastAPI:
     async def list_available_tool_classes() -> Dict[str, Any]:
         """List all available tool classes that can be imported."""
         try:
-            # Common tool modules to check
-            tool_modules = [
-                "core.tool_creation.generic_tools",
-                "tools.semantic_search",
-                "tools.file_tools", 
-                "tools.rally_tools",
-                "tools.oracle_tools",
-                "tools.terminal_tools"
-            ]
-            
-            available_tools = {}
-            
-            for module_name in tool_modules:
-                try:
-                    module = importlib.import_module(module_name)
-                    
-                    # Find classes that have schema method
-                    for attr_name in dir(module):
-                        attr = getattr(module, attr_name)
-                        if (isinstance(attr, type) and 
-                            (hasattr(attr, 'schema') or hasattr(attr, 'data_model')) and 
-                            (attr_name.endswith('Tool') or attr_name.endswith('Tools'))):
-                            
-                            class_path = f"{module_name}.{attr_name}"
-                            available_tools[class_path] = {
-                                "class_name": attr_name,
-                                "module": module_name,
-                                "has_schema": hasattr(attr, 'data_model') and attr.data_model is not None,
-                                "data_model_name": attr.data_model.__name__ if hasattr(attr, 'data_model') and attr.data_model is not None else None
-                            }
-                            
-                except ImportError:
-                    # Skip modules that can't be imported
-                    continue
+            available_tools = _scan_available_tools()
             
             return {
                 "available_tools": available_tools,
@@ -194,23 +205,32 @@ def enhance_app_with_tool_schema_endpoints(app: FastAPI) -> FastAPI:
             if not enabled:
                 raise HTTPException(status_code=400, detail="Tool is disabled")
             
-            # Import the tool class dynamically
-            tool_class = _import_tool_class(class_path)
-            
-            # Create tool factory instance
-            tool_factory = tool_class(
-                name=tool_name,
-                description=description,
-                **config
-            )
-            
-            # Validate it's a proper tool factory
-            from core.tool_creation.tool_factories import BaseToolFactory
-            if not isinstance(tool_factory, BaseToolFactory):
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"Tool class {class_path} must inherit from BaseToolFactory"
+            cache_key = (class_path, tool_name, description, json.dumps(config, sort_keys=True))
+            tool_factory = _test_factory_cache.get(cache_key)
+            if tool_factory is not None:
+                _test_factory_cache.move_to_end(cache_key)
+            else:
+                # Import the tool class dynamically
+                tool_class = _import_tool_class(class_path)
+                
+                # Create tool factory instance
+                tool_factory = tool_class(
+                    name=tool_name,
+                    description=description,
+                    **config
                 )
+                
+                # Validate it's a proper tool factory
+                if not isinstance(tool_factory, BaseToolFactory):
+                    raise HTTPException(
+                        status_code=400, 
+                        detail=f"Tool class {class_path} must inherit from BaseToolFactory"
+                    )
+                
+                # Only validated factories are cached
+                _test_factory_cache[cache_key] = tool_factory
+                if len(_test_factory_cache) > _TEST_FACTORY_CACHE_SIZE:
+                    _test_factory_cache.popitem(last=False)
             
             # Execute the tool
             result = await tool_factory._execute(request.params)
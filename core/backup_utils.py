@@ -2,15 +2,75 @@
 Backup utilities for agent configurations.
 """
 
+import errno
+import heapq
+import operator
 import os
 import shutil
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Sorted backup records keyed by (agents_dir, agent_name): (backup dir st_mtime_ns, records)
+_LIST_BACKUPS_CACHE_SIZE = 32
+_list_backups_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+# Backup filename timestamp, e.g. 20240101_120000
+_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+# copy_file_range errors that mean "not supported here", fall back to a plain copy
+_COPY_FALLBACK_ERRNOS = frozenset({errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP})
+
+
+def _fast_copy(src: str, dst: str) -> None:
+    """
+    Copy file contents, mode and timestamps, letting the kernel move the bytes.
+    
+    Uses os.copy_file_range where available and falls back to
+    shutil.copyfile when the platform or filesystem does not support it,
+    including when it stops short of the source size.
+    
+    Args:
+        src: Source file path
+        dst: Destination file path
+    """
+    with open(src, 'rb') as s:
+        st = os.fstat(s.fileno())
+        copy_file_range = getattr(os, "copy_file_range", None)
+        copied = False
+        if copy_file_range is not None:
+            try:
+                with open(dst, 'wb') as d:
+                    remaining = st.st_size
+                    while remaining > 0:
+                        n = copy_file_range(s.fileno(), d.fileno(), remaining)
+                        if n == 0:
+                            # Some filesystems and special files report EOF early
+                            break
+                        remaining -= n
+                copied = remaining == 0
+            except OSError as e:
+                if e.errno not in _COPY_FALLBACK_ERRNOS:
+                    raise
+        if not copied:
+            shutil.copyfile(src, dst)
+    # Restores rely on getting the file back exactly as it was, as shutil.copy2 did
+    shutil.copystat(src, dst)
+
+
+def _invalidate_backup_listings(agents_dir: str) -> None:
+    """Drop cached list_backups scans for an agents directory after its backups change."""
+    # A directory mtime tick can hide a new or removed file, so rescan on the next listing
+    for cache_key in [key for key in _list_backups_cache if key[0] == agents_dir]:
+        del _list_backups_cache[cache_key]
+
 
 def create_backup_dir(agents_dir: str) -> str:
     """
@@ -36,22 +96,38 @@ def backup_agent_config(agent_name: str, agents_dir: str, backup_reason: str = "
         agents_dir: Directory containing agent configurations
         backup_reason: Reason for backup (update, delete, etc.)
         
+    Returns:
+        Path to backup file if successful, None otherwise
+    """
+    return _backup_one(agent_name, agents_dir, backup_reason, time.strftime(_TIMESTAMP_FORMAT))
+
+
+def _backup_one(agent_name: str, agents_dir: str, backup_reason: str, timestamp: str) -> Optional[str]:
+    """
+    Copy an agent configuration into the backup directory under a given timestamp.
+    
+    Args:
+        agent_name: Name of the agent to backup
+        agents_dir: Directory containing agent configurations
+        backup_reason: Reason for backup
+        timestamp: Formatted timestamp used in the backup filename
+        
     Returns:
         Path to backup file if successful, None otherwise
     """
     try:
         source_file = os.path.join(agents_dir, f"{agent_name}.yaml")
-        
-        if not os.path.exists(source_file):
-            logger.warning(f"Agent config file not found: {source_file}")
-            return None
-        
         backup_dir = create_backup_dir(agents_dir)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_filename = f"{agent_name}_{backup_reason}_{timestamp}.yaml"
         backup_path = os.path.join(backup_dir, backup_filename)
         
-        shutil.copy2(source_file, backup_path)
+        # Opening the source is the existence check
+        try:
+            _fast_copy(source_file, backup_path)
+        except FileNotFoundError:
+            logger.warning(f"Agent config file not found: {source_file}")
+            return None
+        _invalidate_backup_listings(agents_dir)
         logger.info(f"Created backup: {backup_path}")
         return backup_path
         
@@ -71,65 +147,128 @@ def backup_all_agents(agents_dir: str, backup_reason: str = "bulk_backup") -> Li
     Returns:
         List of backup file paths
     """
-    backup_paths = []
-    
     try:
-        for file in os.listdir(agents_dir):
-            if file.endswith(".yaml") and not file.startswith("config.example"):
-                agent_name = file.replace(".yaml", "")
-                backup_path = backup_agent_config(agent_name, agents_dir, backup_reason)
-                if backup_path:
-                    backup_paths.append(backup_path)
+        with os.scandir(agents_dir) as entries:
+            agent_names = [
+                entry.name[:-5] for entry in entries
+                if entry.name.endswith(".yaml")
+                and not entry.name.startswith("config.example")
+                and entry.is_file()
+            ]
     except Exception as e:
         logger.error(f"Failed to backup all agents: {e}")
+        return []
+    
+    if not agent_names:
+        return []
     
-    return backup_paths
+    # One timestamp for the whole batch; copies are I/O bound, so run them concurrently
+    timestamp = time.strftime(_TIMESTAMP_FORMAT)
+    with ThreadPoolExecutor(max_workers=min(32, len(agent_names))) as executor:
+        results = executor.map(
+            lambda name: _backup_one(name, agents_dir, backup_reason, timestamp),
+            agent_names
+        )
+        return [backup_path for backup_path in results if backup_path]
 
 
-def list_backups(agents_dir: str, agent_name: Optional[str] = None) -> List[dict]:
+def list_backups(
+    agents_dir: str,
+    agent_name: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0
+) -> List[dict]:
     """
     List available backups.
     
     Args:
         agents_dir: Directory containing agent configurations
         agent_name: Optional specific agent name to filter backups
+        limit: Optional maximum number of backups to return
+        offset: Number of newest backups to skip
         
     Returns:
-        List of backup information dictionaries
+        List of backup information dictionaries, newest first
     """
     backup_dir = os.path.join(agents_dir, "backups")
-    backups = []
     
-    if not os.path.exists(backup_dir):
-        return backups
+    try:
+        dir_mtime_ns = os.stat(backup_dir).st_mtime_ns
+    except FileNotFoundError:
+        return []
+    
+    # Reuse the previous scan while the backup directory is unchanged
+    cache_key = (agents_dir, agent_name)
+    cached = _list_backups_cache.get(cache_key)
+    if cached is not None and cached[0] == dir_mtime_ns:
+        _list_backups_cache.move_to_end(cache_key)
+        records = cached[1]
+    else:
+        records, complete = _scan_backups(backup_dir, agent_name)
+        if complete:
+            _list_backups_cache[cache_key] = (dir_mtime_ns, records)
+            if len(_list_backups_cache) > _LIST_BACKUPS_CACHE_SIZE:
+                _list_backups_cache.popitem(last=False)
+    
+    # Only the requested window is turned into dicts
+    end = None if limit is None else offset + limit
+    return [
+        {
+            "agent_name": backup_agent_name,
+            "reason": backup_reason,
+            "timestamp": backup_timestamp,
+            "filename": file,
+            "filepath": filepath,
+            "created_time": datetime.fromtimestamp(ctime).isoformat(),
+            "size_bytes": size
+        }
+        for ctime, size, backup_agent_name, backup_reason, backup_timestamp, file, filepath
+        in records[offset:end]
+    ]
+
+
+def _scan_backups(backup_dir: str, agent_name: Optional[str]) -> Tuple[List[tuple], bool]:
+    """
+    Scan the backup directory into raw records sorted newest first.
     
+    Args:
+        backup_dir: Backup directory path
+        agent_name: Optional specific agent name to filter backups
+        
+    Returns:
+        Tuple of the (ctime, size, agent_name, reason, timestamp, filename,
+        filepath) records and whether the scan completed without errors
+    """
+    records = []
+    complete = True
     try:
-        for file in os.listdir(backup_dir):
-            if file.endswith(".yaml"):
-                parts = file.replace(".yaml", "").split("_")
-                if len(parts) >= 3:
-                    backup_agent_name = parts[0]
-                    backup_reason = parts[1]
-                    backup_timestamp = "_".join(parts[2:])
-                    
-                    if agent_name is None or backup_agent_name == agent_name:
-                        backup_info = {
-                            "agent_name": backup_agent_name,
-                            "reason": backup_reason,
-                            "timestamp": backup_timestamp,
-                            "filename": file,
-                            "filepath": os.path.join(backup_dir, file),
-                            "created_time": datetime.fromtimestamp(
-                                os.path.getctime(os.path.join(backup_dir, file))
-                            ).isoformat()
-                        }
-                        backups.append(backup_info)
+        with os.scandir(backup_dir) as entries:
+            for entry in entries:
+                file = entry.name
+                if file.endswith(".yaml"):
+                    parts = file[:-5].split("_", 2)
+                    if len(parts) == 3:
+                        backup_agent_name, backup_reason, backup_timestamp = parts
+                        
+                        if agent_name is None or backup_agent_name == agent_name:
+                            # One stat per entry covers both the ctime and the size
+                            entry_stat = entry.stat()
+                            records.append((
+                                entry_stat.st_ctime,
+                                entry_stat.st_size,
+                                backup_agent_name,
+                                backup_reason,
+                                backup_timestamp,
+                                file,
+                                entry.path
+                            ))
     except Exception as e:
         logger.error(f"Failed to list backups: {e}")
+        complete = False
     
     # Sort by creation time, newest first
-    backups.sort(key=lambda x: x["created_time"], reverse=True)
-    return backups
+    records.sort(key=operator.itemgetter(0), reverse=True)
+    return records, complete
 
 
 def restore_agent_from_backup(backup_filepath: str, agents_dir: str) -> bool:
@@ -150,16 +289,25 @@ def restore_agent_from_backup(backup_filepath: str, agents_dir: str) -> bool:
         
         # Extract agent name from backup filename
         backup_filename = os.path.basename(backup_filepath)
-        agent_name = backup_filename.split("_")[0]
+        agent_name = backup_filename.split("_", 1)[0]
         
         # Create backup of current config before restore
         current_backup = backup_agent_config(agent_name, agents_dir, "pre_restore")
         if current_backup:
             logger.info(f"Created pre-restore backup: {current_backup}")
         
-        # Restore from backup
+        # Restore from backup: stream the bytes into a temp file next to the
+        # target and rename it into place, so a crash never leaves a partial config
         target_file = os.path.join(agents_dir, f"{agent_name}.yaml")
-        shutil.copy2(backup_filepath, target_file)
+        fd, temp_path = tempfile.mkstemp(dir=agents_dir, prefix=f".{agent_name}_", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as dst, open(backup_filepath, 'rb') as src:
+                shutil.copyfileobj(src, dst)
+            shutil.copystat(backup_filepath, temp_path)
+            os.replace(temp_path, target_file)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
         logger.info(f"Restored {agent_name} from backup: {backup_filepath}")
         return True
         
@@ -186,36 +334,33 @@ def cleanup_old_backups(agents_dir: str, keep_count: int = 10) -> int:
     cleaned_count = 0
     
     try:
-        # Group backups by agent name
-        agent_backups = {}
-        for file in os.listdir(backup_dir):
-            if file.endswith(".yaml"):
-                agent_name = file.split("_")[0]
-                if agent_name not in agent_backups:
-                    agent_backups[agent_name] = []
-                
-                filepath = os.path.join(backup_dir, file)
-                agent_backups[agent_name].append({
-                    "file": file,
-                    "path": filepath,
-                    "mtime": os.path.getmtime(filepath)
-                })
-        
-        # Clean up old backups for each agent
-        for agent_name, backups in agent_backups.items():
-            # Sort by modification time, newest first
-            backups.sort(key=lambda x: x["mtime"], reverse=True)
-            
-            # Remove old backups beyond keep_count
-            for backup in backups[keep_count:]:
-                try:
-                    os.remove(backup["path"])
-                    logger.info(f"Cleaned up old backup: {backup['file']}")
-                    cleaned_count += 1
-                except Exception as e:
-                    logger.error(f"Failed to remove backup {backup['file']}: {e}")
+        # Single pass keeping a min-heap of the newest keep_count backups per
+        # agent; anything older is removed as soon as it is seen
+        agent_heaps = {}
+        with os.scandir(backup_dir) as entries:
+            for entry in entries:
+                file = entry.name
+                if file.endswith(".yaml") and entry.is_file():
+                    agent_name = file.split("_", 1)[0]
+                    heap = agent_heaps.setdefault(agent_name, [])
+                    item = (entry.stat(follow_symlinks=False).st_mtime_ns, entry.path)
+                    
+                    if len(heap) < keep_count:
+                        heapq.heappush(heap, item)
+                        continue
+                    if heap and item > heap[0]:
+                        item = heapq.heapreplace(heap, item)
+                    
+                    try:
+                        os.remove(item[1])
+                        logger.info(f"Cleaned up old backup: {os.path.basename(item[1])}")
+                        cleaned_count += 1
+                    except Exception as e:
+                        logger.error(f"Failed to remove backup {os.path.basename(item[1])}: {e}")
                     
     except Exception as e:
         logger.error(f"Failed to cleanup old backups: {e}")
     
+    if cleaned_count:
+        _invalidate_backup_listings(agents_dir)
     return cleaned_count
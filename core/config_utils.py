@@ -8,10 +8,19 @@ import yaml
 from typing import Any, Dict, Union
 from pathlib import Path
 
+# Prefer the libyaml C bindings when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+# Pattern to match ${VAR_NAME} or ${VAR_NAME:default_value}
+_ENV_RE = re.compile(r'\$\{([^}:]+)(?::([^}]*))?\}')
+
 
 def resolve_env_variables(data: Union[str, Dict, list]) -> Union[str, Dict, list]:
     """
-    Recursively resolve environment variable placeholders in configuration data.
+    Resolve environment variable placeholders in configuration data.
     
     Supports two formats:
     - ${VAR_NAME} - Required environment variable (raises error if not found)
@@ -28,12 +37,50 @@ def resolve_env_variables(data: Union[str, Dict, list]) -> Union[str, Dict, list
     """
     if isinstance(data, str):
         return _resolve_env_string(data)
-    elif isinstance(data, dict):
-        return {key: resolve_env_variables(value) for key, value in data.items()}
-    elif isinstance(data, list):
-        return [resolve_env_variables(item) for item in data]
-    else:
+    if not _contains_template(data):
         return data
+    
+    # Containers holding a placeholder are shallow-copied before being
+    # rewritten, so cached configs passed in are never mutated and
+    # untemplated subtrees are shared as-is.
+    root = data.copy()
+    stack = [root]
+    while stack:
+        container = stack.pop()
+        keys = container.keys() if isinstance(container, dict) else range(len(container))
+        for key in keys:
+            value = container[key]
+            if isinstance(value, str):
+                if '${' in value:
+                    container[key] = _resolve_env_string(value)
+            elif isinstance(value, (dict, list)) and _contains_template(value):
+                value = value.copy()
+                container[key] = value
+                stack.append(value)
+    return root
+
+
+def _contains_template(data: Any) -> bool:
+    """
+    Check whether any string inside data contains a ${...} placeholder.
+    
+    Args:
+        data: Configuration data (string, dict, list or scalar)
+        
+    Returns:
+        True on the first string containing '${', False otherwise
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, str):
+            if '${' in value:
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return False
 
 
 def _resolve_env_string(text: str) -> str:
@@ -46,14 +93,17 @@ def _resolve_env_string(text: str) -> str:
     Returns:
         String with environment variables resolved
     """
-    # Pattern to match ${VAR_NAME} or ${VAR_NAME:default_value}
-    pattern = r'\$\{([^}:]+)(?::([^}]*))?\}'
+    # Most strings hold no placeholder at all
+    if '${' not in text:
+        return text
+    
+    getenv = os.environ.get
     
     def replace_env_var(match):
         var_name = match.group(1)
         default_value = match.group(2)
         
-        env_value = os.getenv(var_name)
+        env_value = getenv(var_name)
         
         if env_value is not None:
             return env_value
@@ -62,15 +112,75 @@ def _resolve_env_string(text: str) -> str:
         else:
             raise ValueError(f"Required environment variable '{var_name}' is not set")
     
-    return re.sub(pattern, replace_env_var, text)
+    return _ENV_RE.sub(replace_env_var, text)
+
+
+def load_from_stream(stream) -> Any:
+    """
+    Parse YAML directly from an open file object.
+    
+    Args:
+        stream: Open (preferably binary) file object
+        
+    Returns:
+        Parsed configuration data
+    """
+    return yaml.load(stream, Loader=_YamlLoader)
 
 
 def load_from_file(file_path: str):
-    with open(file_path, 'r', encoding='utf-8') as file:
-        config = yaml.safe_load(file)
+    with open(file_path, 'rb') as file:
+        config = load_from_stream(file)
+    
+    return config
+
+
+def dump_to_file(data: Any, file_path: str) -> None:
+    """
+    Serialize data as YAML into a file.
+    
+    Args:
+        data: Configuration data built from plain dicts, lists and scalars
+        file_path: Path to the YAML file to write
+    """
+    with open(file_path, 'w') as file:
+        yaml.dump(data, file, Dumper=_YamlDumper)
+
+
+# Parsed YAML files keyed by absolute path: {path: (st_mtime_ns, st_size, config)}
+_yaml_cache: Dict[str, tuple] = {}
+
+
+def load_from_file_cached(file_path: str):
+    """
+    Load a YAML file, reusing the previous parse while the file is unchanged.
     
+    The returned data is shared between callers and must not be mutated.
+    
+    Args:
+        file_path: Path to the YAML file
+        
+    Returns:
+        Parsed configuration data
+    """
+    path = os.path.abspath(file_path)
+    st = os.stat(path)
+    signature = (st.st_mtime_ns, st.st_size)
+    
+    cached = _yaml_cache.get(path)
+    if cached is not None and cached[:2] == signature:
+        return cached[2]
+    
+    config = load_from_file(path)
+    _yaml_cache[path] = (*signature, config)
     return config
 
+
+def invalidate_config_cache(file_path: str) -> None:
+    """Drop the cached parse of a YAML file, e.g. after rewriting it."""
+    _yaml_cache.pop(os.path.abspath(file_path), None)
+
+
 def load_config_with_env(file_path: str) -> Dict[str, Any]:
     """
     Load a YAML configuration file and resolve environment variables.
@@ -81,7 +191,7 @@ def load_config_with_env(file_path: str) -> Dict[str, Any]:
     Returns:
         Configuration dictionary with environment variables resolved
     """
-    config = load_from_file(file_path)
+    config = load_from_file_cached(file_path)
     
     return resolve_env_variables(config)
 
@@ -107,6 +217,11 @@ def validate_required_env_vars(config: Dict[str, Any],
         raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
 
 def load_config(file_path, resolve_env_var: bool=True):
+    # Accept an already opened file object as well as a path
+    if hasattr(file_path, 'read'):
+        config = load_from_stream(file_path)
+        return resolve_env_variables(config) if resolve_env_var else config
+
     config_file = Path(file_path)
     if not config_file.exists():
         raise FileNotFoundError(f"Configuration file not found: {file_path}")
@@ -114,7 +229,7 @@ def load_config(file_path, resolve_env_var: bool=True):
     # Load configuration with environment variable resolution
     if resolve_env_var:
         return load_config_with_env(str(config_file))
-    return load_from_file(str(config_file))
+    return load_from_file_cached(str(config_file))
 
 # Example usage and testing
 if __name__ == "__main__":
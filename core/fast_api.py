@@ -1,17 +1,13 @@
-from google.adk.cli.fast_api import get_fast_api_app
-from google.adk.cli.adk_web_server import AdkWebServer
 from google.adk.cli.utils.agent_loader import AgentLoader
 
-from google.adk.sessions.in_memory_session_service import InMemorySessionService
-from google.adk.artifacts.in_memory_artifact_service import InMemoryArtifactService
-from google.adk.auth.credential_service.in_memory_credential_service import InMemoryCredentialService
-from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
-
-from google.adk.evaluation.local_eval_set_results_manager import LocalEvalSetResultsManager
-from google.adk.evaluation.local_eval_sets_manager import LocalEvalSetsManager
-
 from fastapi import FastAPI, HTTPException, Request, Response
-from typing import Dict, Any
+from fastapi.responses import ORJSONResponse
+from typing import Dict, Any, FrozenSet
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 import sys
 import os
@@ -19,40 +15,162 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.tool_creation.tool_registry import ToolRegistry
 from core.agent_utils import create_agent
-from core.config_utils import load_config, load_from_file, resolve_env_variables
+from core.config_utils import load_config, load_from_file_cached, dump_to_file, invalidate_config_cache, resolve_env_variables
 from core.api_backup import enhance_app_with_backup_endpoints, create_backup_before_update
 from core.api_tools import enhance_app_with_tool_schema_endpoints
 
+import asyncio
+import contextlib
+import importlib
 import json
-import yaml
+import logging
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# Web server, service and evaluation classes are only needed to build the app,
+# so they are imported inside get_fast_api_app (or on first attribute access)
+_LAZY_IMPORTS = {
+    "AdkWebServer": "google.adk.cli.adk_web_server",
+    "InMemorySessionService": "google.adk.sessions.in_memory_session_service",
+    "InMemoryArtifactService": "google.adk.artifacts.in_memory_artifact_service",
+    "InMemoryCredentialService": "google.adk.auth.credential_service.in_memory_credential_service",
+    "InMemoryMemoryService": "google.adk.memory.in_memory_memory_service",
+    "LocalEvalSetResultsManager": "google.adk.evaluation.local_eval_set_results_manager",
+    "LocalEvalSetsManager": "google.adk.evaluation.local_eval_sets_manager",
+}
 
-agents_schema_cache = {}
+
+def __getattr__(name: str) -> Any:
+    module_path = _LAZY_IMPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_path), name)
+    globals()[name] = value
+    return value
+
+
+def _load_agent_schema(agents_dir: str, agent_name: str) -> Dict[str, Any]:
+    """Return the tools and root agent of an agent config, parsed through the YAML cache."""
+    config = load_from_file_cached(os.path.join(agents_dir, f"{agent_name}.yaml"))
+    schema = {
+        "tools": config.get("tools", []),
+        "root_agent": config.get("root_agent", {})
+    }
+    return schema
+
+
+def _write_agent_yaml(config_path: str, config: Dict[str, Any]) -> None:
+    """Atomically dump an agent config to disk and drop its stale cached parse and agent."""
+    # Write next to the target and rename into place so readers never see a partial file
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(config_path) or ".",
+        prefix=f".{os.path.basename(config_path)}_",
+        suffix=".tmp"
+    )
+    os.close(fd)
+    try:
+        dump_to_file(config, temp_path)
+        # mkstemp creates the file 0600; keep the usual permissions of agent configs
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, config_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    invalidate_config_cache(config_path)
+    _agent_cache.pop(config_path, None)
+    # A directory mtime tick can hide a new file, so rescan on the next listing
+    _agent_names_cache.pop(os.path.dirname(config_path), None)
+
+
+# Serializes backup + write sequences per agent; different agents proceed concurrently.
+# {agent_name: [lock, holders and waiters]}, an entry is dropped when its count reaches zero
+_agent_locks: Dict[str, list] = {}
+
+
+@contextlib.asynccontextmanager
+async def _agent_lock(agent_name: str):
+    """Hold the per-agent write lock, keeping an entry only while a request uses it."""
+    entry = _agent_locks.get(agent_name)
+    if entry is None:
+        entry = _agent_locks[agent_name] = [asyncio.Lock(), 0]
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if not entry[1]:
+            del _agent_locks[agent_name]
+
+
+# Built agents keyed by config path: {path: ((st_mtime_ns, st_size), config, tool_registry, root_agent)}
+_agent_cache: Dict[str, tuple] = {}
+
+# Agent names per agents directory: {agents_dir: (st_mtime_ns, names, frozenset(names))}
+_agent_names_cache: Dict[str, tuple] = {}
 
 
 class YamlAgentLoader(AgentLoader):
     def load_agent(self, agent_name: str):
-        with open(os.path.join(self.agents_dir, f"{agent_name}.yaml"), "r") as f:
-            tool_registry = ToolRegistry()
-            config_path = os.path.join(self.agents_dir, f"{agent_name}.yaml")
+        config_path = os.path.join(self.agents_dir, f"{agent_name}.yaml")
+        st = os.stat(config_path)
+        signature = (st.st_mtime_ns, st.st_size)
+
+        # Reuse the parsed config and agent tree while the file is unchanged
+        cached = _agent_cache.get(config_path)
+        if cached is not None and cached[0] == signature:
+            return cached[3]
 
-            tool_registry.load_from_config(str(config_path))
+        # Parse once and share the config between the registry and the agent
+        config = load_from_file_cached(config_path)
+        resolved_config = resolve_env_variables(config)
 
-            config = load_from_file(str(config_path))
-            agents_schema_cache[agent_name] = {
-                "tools": config.get("tools", []),
-                "root_agent": config.get("root_agent", {})
-            }
-            config = resolve_env_variables(config)
+        tool_registry = ToolRegistry()
+        tool_registry.load_from_dict(resolved_config)
 
-            return create_agent(config.get("root_agent"), tool_registry) 
+        root_agent = create_agent(resolved_config.get("root_agent"), tool_registry)
+        _agent_cache[config_path] = (signature, config, tool_registry, root_agent)
+        return root_agent
+
+    def _agent_names(self) -> tuple:
+        """Scan the agents directory, reusing the last scan while its mtime is unchanged."""
+        mtime_ns = os.stat(self.agents_dir).st_mtime_ns
+        cached = _agent_names_cache.get(self.agents_dir)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached
+
+        with os.scandir(self.agents_dir) as entries:
+            names = tuple(
+                entry.name[:-5] for entry in entries
+                if entry.name.endswith(".yaml")
+                and not entry.name.startswith("config.example")
+                and entry.is_file()
+            )
+        cached = (mtime_ns, names, frozenset(names))
+        _agent_names_cache[self.agents_dir] = cached
+        return cached
+
+    def invalidate_agent(self, agent_name: str) -> None:
+        """Drop the parsed YAML, built agent and name listing after an agent's file is replaced."""
+        config_path = os.path.join(self.agents_dir, f"{agent_name}.yaml")
+        invalidate_config_cache(config_path)
+        _agent_cache.pop(config_path, None)
+        _agent_names_cache.pop(self.agents_dir, None)
 
     def list_agents(self):
-        for file in os.listdir(self.agents_dir):
-            if file.endswith(".yaml") and not file.startswith("config.example"):
-                yield file.replace(".yaml", "")
+        yield from self._agent_names()[1]
+
+    def list_agents_set(self) -> FrozenSet[str]:
+        """Return the agent names as a set for membership checks."""
+        return self._agent_names()[2]
+
 
+def enhance_default_fast_api_app(app: FastAPI, agent_loader: YamlAgentLoader) -> FastAPI:
+    # Serialize responses of the endpoints registered below with orjson when available
+    if orjson is not None:
+        app.router.default_response_class = ORJSONResponse
 
-def enhance_default_fast_api_app(app: FastAPI, agent_loader: AgentLoader) -> FastAPI:
     @app.get(
         "/version",
         tags=["system"],
@@ -72,8 +190,8 @@ def enhance_default_fast_api_app(app: FastAPI, agent_loader: AgentLoader) -> Fas
     )
     async def get_agents() -> Dict[str, Any]:
       """List all available agent configurations."""
-      # Convert generator to list, then create dict with agents
-      agents_list = list(agent_loader.list_agents())
+      # Convert generator to list off the event loop, then create dict with agents
+      agents_list = await asyncio.to_thread(list, agent_loader.list_agents())
       return {
           "agents": agents_list,
           "count": len(agents_list)
@@ -92,13 +210,14 @@ def enhance_default_fast_api_app(app: FastAPI, agent_loader: AgentLoader) -> Fas
       if agent_name is None:
         raise HTTPException(status_code=400, detail="Agent name is required")
       
-      agents_list = list(agent_loader.list_agents())
-    
-      if agent_name in agents_list:
-        raise HTTPException(status_code=400, detail="Agent already exists")
+      async with _agent_lock(agent_name):
+        agents = await asyncio.to_thread(agent_loader.list_agents_set)
+      
+        if agent_name in agents:
+          raise HTTPException(status_code=400, detail="Agent already exists")
 
-      with open(os.path.join(agent_loader.agents_dir, f"{agent_name}.yaml"), "w") as f:
-        yaml.dump(config, f)
+        config_path = os.path.join(agent_loader.agents_dir, f"{agent_name}.yaml")
+        await asyncio.to_thread(_write_agent_yaml, config_path, config)
       
       return {
           "message": f"Agent {agent_name} created successfully",
@@ -113,31 +232,28 @@ def enhance_default_fast_api_app(app: FastAPI, agent_loader: AgentLoader) -> Fas
     )
     async def update_agent(agent_name: str, request: Request) -> Dict[str, Any]:
       """Update an existing agent configuration with automatic backup."""
-      agents_list = list(agent_loader.list_agents())
-    
-      if agent_name not in agents_list:
-        raise HTTPException(status_code=404, detail="Agent not found")
-
-      # Create backup before updating
-      backup_path = create_backup_before_update(agent_name, agent_loader, "update")
-
-      try:
-        config = await request.json()
-        with open(os.path.join(agent_loader.agents_dir, f"{agent_name}.yaml"), "w") as f:
-          yaml.dump(config, f)
-        
-        # Clear cache to force reload
-        if agent_name in agents_schema_cache:
-          del agents_schema_cache[agent_name]
-        
-        return {
-          "message": f"Agent {agent_name} updated successfully",
-          "backup_created": backup_path,
-          "agent_name": agent_name,
-          "status": "success"
-        }
-      except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to update agent: {str(e)}")
+      async with _agent_lock(agent_name):
+        agents = await asyncio.to_thread(agent_loader.list_agents_set)
+      
+        if agent_name not in agents:
+          raise HTTPException(status_code=404, detail="Agent not found")
+
+        # Create backup before updating
+        backup_path = await asyncio.to_thread(create_backup_before_update, agent_name, agent_loader, "update")
+
+        try:
+          config = await request.json()
+          config_path = os.path.join(agent_loader.agents_dir, f"{agent_name}.yaml")
+          await asyncio.to_thread(_write_agent_yaml, config_path, config)
+          
+          return {
+            "message": f"Agent {agent_name} updated successfully",
+            "backup_created": backup_path,
+            "agent_name": agent_name,
+            "status": "success"
+          }
+        except Exception as e:
+          raise HTTPException(status_code=500, detail=f"Failed to update agent: {str(e)}")
     
     @app.get(
         "/agents/{agent_name}",
@@ -146,13 +262,16 @@ def enhance_default_fast_api_app(app: FastAPI, agent_loader: AgentLoader) -> Fas
     )
     async def get_agent(agent_name: str) -> Dict[str, Any]:
         """Get agent configuration."""
-        schema = agents_schema_cache.get(agent_name, None)
-        if schema is None:
-            agent_loader.load_agent(agent_name)
-            schema = agents_schema_cache.get(agent_name, None)
-        if schema is None:
+        # Only the YAML is needed here, not the whole agent and tool registry; the
+        # parse is reused while the file's mtime and size are unchanged
+        try:
+            return _load_agent_schema(agent_loader.agents_dir, agent_name)
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="Agent not found")
-        return agents_schema_cache.get(agent_name, {})
+
+    # Release the pooled HTTP connections shared by the Rally tools
+    from tools.rally_tools import close_session
+    app.add_event_handler("shutdown", close_session)
 
     # Enhance app with backup endpoints
     app = enhance_app_with_backup_endpoints(app, agent_loader)
@@ -163,9 +282,24 @@ def enhance_default_fast_api_app(app: FastAPI, agent_loader: AgentLoader) -> Fas
     return app
 
 def get_fast_api_app() -> FastAPI:
+    from google.adk.cli.adk_web_server import AdkWebServer
+    from google.adk.sessions.in_memory_session_service import InMemorySessionService
+    from google.adk.artifacts.in_memory_artifact_service import InMemoryArtifactService
+    from google.adk.auth.credential_service.in_memory_credential_service import InMemoryCredentialService
+    from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
+    from google.adk.evaluation.local_eval_set_results_manager import LocalEvalSetResultsManager
+    from google.adk.evaluation.local_eval_sets_manager import LocalEvalSetsManager
+
     agents_dir = "./agents"
     agent_loader = YamlAgentLoader(agents_dir)
 
+    # Pre-warm the YAML cache so the first /agents/{name} read does not parse
+    for agent_name in agent_loader.list_agents():
+        try:
+            _load_agent_schema(agents_dir, agent_name)
+        except Exception as e:
+            logger.warning(f"Failed to pre-load schema for agent '{agent_name}': {e}")
+
     session_service = InMemorySessionService()
     artifact_service = InMemoryArtifactService()
     credential_service = InMemoryCredentialService()
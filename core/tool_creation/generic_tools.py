@@ -8,31 +8,26 @@ from typing import Any, Dict
 class RemoteMCPTools(BaseToolFactory):
     """Base class for MCP tools."""
     
+    __slots__ = ("_headers", "_url")
+    
     data_model = RemoteMCPToolsConfig
     
     def __init__(self, name: str, description: str, **config):
         super().__init__(name, description, **config)
         # Validate configuration using Pydantic model
         self.config = self.validate_config(config)
+        
+        # Connection settings do not change between instances, so build them once
+        headers = {"Authorization": f"Bearer {self.config.api_key}"} if self.config.api_key else {}
+        headers.update(self.config.headers or {})
+        self._headers = headers
+        self._url = str(self.config.url)
 
     def create_instance(self):
-        # Use validated config for better type safety
-        config = self.config
-        # Build headers with authorization
-        headers = {}
-        if isinstance(config, RemoteMCPToolsConfig):
-            if config.api_key:
-               headers = {"Authorization": f"Bearer {config.api_key}"}
-            headers.update(config.headers if config.headers else {})
-        elif isinstance(config, dict):
-            if config.get('api_key'):
-                headers = {"Authorization": f"Bearer {config.get('api_key', '')}"}
-            headers.update(config.get('headers', {}))
-        
         return MCPToolset(
             connection_params=StreamableHTTPConnectionParams(
-                url=str(config.get('url', '') if isinstance(config, dict) else config.url),
-                headers=headers
+                url=self._url,
+                headers=self._headers
             ),
-            tool_filter=config.get('tools_filter', []) if isinstance(config, dict) else config.tools_filter
-        )
\ No newline at end of file
+            tool_filter=self.config.tools_filter or []
+        )
@@ -1,11 +1,13 @@
 """Shared Pydantic models for tool creation system."""
 
 from typing import Any, List, Optional, Dict
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
 
 
 class ToolParam(BaseModel):
     """Individual parameter definition for LLM callable parameters."""
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+    
     name: str = Field(description="Parameter name")
     type: str = Field(description="Parameter type (string, integer, number, boolean, array, object)")
     description: str = Field(description="Parameter description")
@@ -15,6 +17,8 @@ class ToolParam(BaseModel):
 
 class RemoteMCPToolsConfig(BaseModel):
     """Configuration schema for Remote MCP Tools."""
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+    
     url: HttpUrl = Field(description="MCP server URL endpoint")
     api_key: str = Field(description="API key for authentication")
     tools_filter: Optional[List[str]] = Field(
@@ -1,13 +1,34 @@
 """Base tool interface for AI agent tools."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
 import inspect
+import logging
 
 from google.adk.tools import BaseTool, FunctionTool, MCPToolset
 from google.adk.tools.mcp_tool.mcp_toolset import StreamableHTTPConnectionParams
 
 
+logger = logging.getLogger(__name__)
+
+# Parameter type names accepted in tool configs
+_TYPE_MAPPING: Mapping[str, Any] = MappingProxyType({
+    'string': str,
+    'str': str,
+    'int': int,
+    'integer': int,
+    'float': float,
+    'bool': bool,
+    'boolean': bool,
+    'list': list,
+    'dict': dict,
+    'any': Any
+})
+
+_KW_ONLY = inspect.Parameter.KEYWORD_ONLY
+_EMPTY = inspect.Parameter.empty
+
 
 def create_function_with_signature(func_name: str, parameters: Dict[str, inspect.Parameter], 
                                   func_implementation: callable) -> callable:
@@ -25,13 +46,32 @@ def create_function_with_signature(func_name: str, parameters: Dict[str, inspect
     # Create signature
     sig = inspect.Signature(parameters=list(parameters.values()))
     
+    # All parameters are keyword-only, so binding reduces to a dict merge
+    defaults = {
+        param_name: param.default
+        for param_name, param in parameters.items()
+        if param.default is not inspect.Parameter.empty
+    }
+    required = frozenset(
+        param_name
+        for param_name, param in parameters.items()
+        if param.default is inspect.Parameter.empty
+    )
+    known = frozenset(parameters)
+    
     # Create wrapper function
-    async def dynamic_func(*args, **kwargs):
-        # Bind arguments to signature
-        bound = sig.bind(*args, **kwargs)
-        bound.apply_defaults()
-        print(f"Bound arguments: {bound.arguments}")
-        return await func_implementation(params=bound.arguments)
+    async def dynamic_func(**kwargs):
+        missing = required - kwargs.keys()
+        if missing:
+            raise TypeError(f"{func_name}() missing required keyword arguments: {sorted(missing)}")
+        unexpected = kwargs.keys() - known
+        if unexpected:
+            raise TypeError(f"{func_name}() got unexpected keyword arguments: {sorted(unexpected)}")
+        
+        arguments = {**defaults, **kwargs}
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Bound arguments: %s", arguments)
+        return await func_implementation(params=arguments)
     
     # Set function attributes
     dynamic_func.__name__ = func_name
@@ -43,6 +83,8 @@ def create_function_with_signature(func_name: str, parameters: Dict[str, inspect
 class BaseToolFactory(ABC):
     """Base class for all AI agent tools."""
 
+    __slots__ = ("name", "description", "config")
+
     data_model = None
     
     def __init__(self, name: str, description: str, **config):
@@ -76,92 +118,111 @@ class BaseToolFactory(ABC):
 
 class BaseFunctionToolFactory(BaseToolFactory):
     """Base class for function tools."""
+
+    __slots__ = ("_dynamic_func",)
+
     def __init__(self, name: str, description: str, **config):
         super().__init__(name, description, **config)
         
-        print(f"Creating dynamic function: {name}, {config.get('params', {})}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Creating dynamic function: %s, %s", name, config.get('params', {}))
+        
+        # Unpack the parameter definitions once for both the signature and the docstring
+        param_specs = self._compile_param_specs(config.get('params', []))
         
         # Convert parameter definitions to inspect.Parameter objects
-        parameters = self._convert_params_to_inspect_parameters(config.get('params', []))
+        parameters = self._convert_params_to_inspect_parameters(param_specs)
         
         # Generate docstring with parameter documentation
-        docstring = self._generate_docstring(description, config.get('params', []))
+        docstring = self._generate_docstring(
+            description,
+            param_specs,
+            compact=config.get('compact_docstring', False)
+        )
         
         dynamic_function = create_function_with_signature(name, parameters, self._execute)
         dynamic_function.__doc__ = docstring
-        setattr(self, name, dynamic_function)
+        self._dynamic_func = dynamic_function
     
-    def _convert_params_to_inspect_parameters(self, param_defs):
-        """Convert parameter definitions to inspect.Parameter objects.
+    @staticmethod
+    def _compile_param_specs(param_defs):
+        """Unpack parameter definitions into flat tuples.
         
         Args:
             param_defs: List of parameter definitions with 'name', 'type', 'description', and optional 'default'
             
         Returns:
-            Dict of parameter names to inspect.Parameter objects
+            Tuple of (name, type_name, python_type, description, default) tuples;
+            default is inspect.Parameter.empty when the parameter has none
         """
-        parameters = {}
-        
-        # Type mapping
-        type_mapping = {
-            'string': str,
-            'str': str,
-            'int': int,
-            'integer': int,
-            'float': float,
-            'bool': bool,
-            'boolean': bool,
-            'list': list,
-            'dict': dict,
-            'any': Any
-        }
-        
+        specs = []
         for param_def in param_defs:
-            param_name = param_def['name']
-            param_type = type_mapping.get(param_def.get('type', 'any'), str)
-            
-            # Determine if parameter has a default value
-            if 'default' in param_def:
-                default_value = param_def['default']
-            else:
-                default_value = inspect.Parameter.empty
+            type_name = param_def.get('type', 'any')
+            specs.append((
+                param_def['name'],
+                type_name,
+                _TYPE_MAPPING.get(type_name, str),
+                param_def.get('description', ''),
+                param_def.get('default', _EMPTY)
+            ))
+        return tuple(specs)
+    
+    def _convert_params_to_inspect_parameters(self, param_specs):
+        """Convert parameter specs to inspect.Parameter objects.
+        
+        Args:
+            param_specs: Parameter tuples from _compile_param_specs
             
-            parameters[param_name] = inspect.Parameter(
+        Returns:
+            Dict of parameter names to inspect.Parameter objects
+        """
+        return {
+            param_name: inspect.Parameter(
                 name=param_name,
-                kind=inspect.Parameter.KEYWORD_ONLY,
+                kind=_KW_ONLY,
                 annotation=param_type,
                 default=default_value
             )
-        
-        return parameters
+            for param_name, _, param_type, _, default_value in param_specs
+        }
     
-    def _generate_docstring(self, description, param_defs):
+    def _generate_docstring(self, description, param_specs, compact=False):
         """Generate a docstring with parameter documentation.
         
         Args:
             description: Function description
-            param_defs: List of parameter definitions
+            param_specs: Parameter tuples from _compile_param_specs
+            compact: Leave out the description separator for parameters without
+                a description, keeping the text sent to the LLM short
             
         Returns:
             Formatted docstring
         """
-        docstring_parts = [description]
+        lines = [description]
         
-        if param_defs:
-            docstring_parts.append("")
-            docstring_parts.append("Args:")
-            for param_def in param_defs:
-                param_desc = f"    {param_def['name']} ({param_def.get('type', 'any')}): {param_def.get('description', '')}"
-                if 'default' in param_def:
-                    param_desc += f" Defaults to {param_def['default']}."
-                docstring_parts.append(param_desc)
+        if param_specs:
+            lines.append("\nArgs:")
+            lines.extend(
+                self._format_param_line(param_spec, compact)
+                for param_spec in param_specs
+            )
         
-        return "\n".join(docstring_parts)
+        return "\n".join(lines)
+    
+    @staticmethod
+    def _format_param_line(param_spec, compact):
+        """Format the docstring line documenting one parameter."""
+        param_name, type_name, _, param_text, default_value = param_spec
+        param_desc = f"    {param_name} ({type_name})"
+        if default_value is not _EMPTY:
+            default_text = f"Defaults to {default_value}."
+            param_text = f"{param_text} {default_text}" if param_text or not compact else default_text
+        if param_text or not compact:
+            param_desc += f": {param_text}"
+        return param_desc
     
     def create_instance(self):
-        # Get the dynamically created function by the name
-        func = getattr(self, self.name)
-        return FunctionTool(func)
+        return FunctionTool(self._dynamic_func)
 
     @abstractmethod
     async def _execute(self, params: Dict[str, Any]) -> Any:
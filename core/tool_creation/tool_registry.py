@@ -1,9 +1,11 @@
 """Simple plugin registry with dependency injection for AI agent tools."""
 
 import yaml
+import functools
 import importlib
 import logging
-from typing import Dict, Any, Optional, List
+import sys
+from typing import Callable, Dict, Any, Optional, List
 from pathlib import Path
 
 from core.tool_creation.tool_factories import BaseToolFactory
@@ -14,11 +16,27 @@ from google.adk.tools import BaseTool
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def _import_class(class_path: str):
+    """Dynamically import a class from a string path, memoized per path."""
+    try:
+        module_path, class_name = class_path.rsplit('.', 1)
+        module = importlib.import_module(module_path)
+        return getattr(module, class_name)
+    except (ValueError, ImportError, AttributeError) as e:
+        raise ImportError(f"Could not import class '{class_path}': {e}")
+
+
 class ToolRegistry:
-    """Simple plugin registry that loads tools from YAML configuration."""
+    """Simple plugin registry that loads tools from YAML configuration.
+    
+    Tools are registered as factories when the configuration is loaded and
+    only imported and instantiated the first time they are requested.
+    """
     
     def __init__(self):
-        self._tools: Dict[str, BaseToolFactory] = {}
+        self._factories: Dict[str, Callable[[], BaseToolFactory]] = {}
+        self._instantiated: Dict[str, BaseToolFactory] = {}
         self._config: Dict[str, Any] = {}
     
     def load_from_config(self, config_path: str) -> None:
@@ -28,31 +46,44 @@ class ToolRegistry:
             raise FileNotFoundError(f"Configuration file not found: {config_path}")
         
         # Load configuration with environment variable resolution
-        self._config = load_config_with_env(str(config_file))
+        self.load_from_dict(load_config_with_env(str(config_file)))
+    
+    def load_from_dict(self, config: Dict[str, Any]) -> None:
+        """Load tools from an already parsed (and env-resolved) configuration."""
+        self._config = config
         
         tools_config = self._config.get('tools', {})
         
         for tool_name, tool_config in tools_config.items():
             try:
                 self._load_tool(tool_name, tool_config)
-                logger.info(f"Successfully loaded tool: {tool_name}")
             except Exception as e:
                 logger.error(f"Failed to load tool '{tool_name}': {e}")
                 raise
     
     def _load_tool(self, tool_name: str, tool_config: Dict[str, Any]) -> None:
-        """Load a single tool from configuration."""
+        """Register a single tool from configuration without instantiating it."""
         class_path = tool_config['class']
-        config = tool_config.get('config', {})
         enabled = tool_config.get('enabled', True)
         
         if not enabled:
             logger.info(f"Tool '{tool_name}' is disabled, skipping...")
             return
         
+        self._factories[tool_name] = lambda: self._create_tool(tool_name, class_path, tool_config)
+        self._instantiated.pop(tool_name, None)
+    
+    def _create_tool(self, tool_name: str, class_path: str, tool_config: Dict[str, Any]) -> BaseToolFactory:
+        """Import and instantiate a registered tool."""
+        config = tool_config.get('config', {})
+        
         # Import the tool class
         tool_class = self._import_class(class_path)
         
+        # Validate it's a proper tool before running its constructor
+        if not (isinstance(tool_class, type) and issubclass(tool_class, BaseToolFactory)):
+            raise TypeError(f"Tool class {class_path} must inherit from BaseToolFactory")
+        
         # Create tool instance with dependency injection
         tool_factory = tool_class(
             name=tool_name,
@@ -60,36 +91,42 @@ class ToolRegistry:
             **config
         )
 
-        # Validate it's a proper tool
-        if not isinstance(tool_factory, BaseToolFactory):
-            raise TypeError(f"Tool class {class_path} must inherit from BaseToolFactory")
-
-        self._tools[tool_name] = tool_factory
+        logger.info(f"Successfully loaded tool: {tool_name}")
+        return tool_factory
     
     def _import_class(self, class_path: str):
         """Dynamically import a class from a string path."""
-        try:
-            module_path, class_name = class_path.rsplit('.', 1)
-            module = importlib.import_module(module_path)
-            return getattr(module, class_name)
-        except (ValueError, ImportError, AttributeError) as e:
-            raise ImportError(f"Could not import class '{class_path}': {e}")
+        return _import_class(class_path)
 
     def get_tool(self, tool_name: str) -> Optional[BaseToolFactory]:
-        """Get a tool by name."""
-        return self._tools.get(tool_name)
+        """Get a tool by name, instantiating it on first use."""
+        tool = self._instantiated.get(tool_name)
+        if tool is not None:
+            return tool
+        
+        factory = self._factories.get(tool_name)
+        if factory is None:
+            return None
+        
+        try:
+            tool = factory()
+        except Exception as e:
+            logger.error(f"Failed to load tool '{tool_name}': {e}")
+            raise
+        self._instantiated[tool_name] = tool
+        return tool
 
     def get_all_available_tools(self) -> Dict[str, BaseToolFactory]:
-        """Get all loaded tools."""
-        return self._tools.copy()
+        """Get all registered tools, instantiating any not yet used."""
+        return {name: self.get_tool(name) for name in self._factories}
     
     def list_tool_names(self) -> List[str]:
         """Get list of all tool names."""
-        return list(self._tools.keys())
+        return list(self._factories.keys())
     
     def has_tool(self, tool_name: str) -> bool:
         """Check if a tool is registered."""
-        return tool_name in self._tools
+        return tool_name in self._factories
     
     def get_tool_schema(self, tool_name: str) -> Optional[Dict[str, Any]]:
         """Get the schema for a specific tool."""
@@ -100,12 +137,30 @@ class ToolRegistry:
         """Get schemas for all tools."""
         return {
             name: tool.get_schema() 
-            for name, tool in self._tools.items()
+            for name, tool in self.get_all_available_tools().items()
         }
         
     
-    def reload_config(self, config_path: str) -> None:
-        """Reload configuration and tools with environment variable resolution."""
-        self._tools.clear()
+    def reload_config(self, config_path: str, hot_reload: bool = False) -> None:
+        """Reload configuration and tools with environment variable resolution.
+        
+        With hot_reload, the already imported modules of the configured tool
+        classes are reloaded with importlib.reload, so edited tool code is
+        picked up. Other modules that imported a tool class keep the old one.
+        """
+        self._factories.clear()
+        self._instantiated.clear()
         self.load_from_config(config_path)
+        if hot_reload:
+            # import_module would hand back the cached module from sys.modules
+            module_paths = {
+                tool_config['class'].rsplit('.', 1)[0]
+                for tool_config in self._config.get('tools', {}).values()
+                if '.' in tool_config.get('class', '')
+            }
+            for module_path in module_paths:
+                module = sys.modules.get(module_path)
+                if module is not None:
+                    importlib.reload(module)
+            _import_class.cache_clear()
         logger.info("Plugin registry reloaded successfully")
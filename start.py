@@ -37,7 +37,15 @@ def wait_for_port(port, timeout=10):
                 time.sleep(0.1)
     return False
 
+_started = False
+
 def main():
+    # Starting twice would launch a second server and window
+    global _started
+    if _started:
+        return
+    _started = True
+
     port = find_free_port()
     t = threading.Thread(target=start_server, args=(port,), daemon=True)
     t.start()
@@ -62,8 +70,6 @@ if __name__ == "__main__":
     else:
         main()
 
-    main()
-
 
 # if __name__ == "__main__":
 #     app = get_fast_api_app()
@@ -0,0 +1,71 @@
+"""Regression tests for agent config backups."""
+
+import os
+
+from core import backup_utils
+
+
+def _write_agent(agents_dir, name, content="root_agent:\n  name: test\n"):
+    path = agents_dir / f"{name}.yaml"
+    path.write_text(content)
+    return path
+
+
+def test_fast_copy_keeps_content_mode_and_mtime(tmp_path):
+    src = tmp_path / "src.yaml"
+    src.write_bytes(os.urandom(200_000))
+    os.chmod(src, 0o640)
+    os.utime(src, ns=(1_000_000_000_000_000_000, 1_000_000_000_000_000_000))
+    dst = tmp_path / "dst.yaml"
+
+    backup_utils._fast_copy(str(src), str(dst))
+
+    assert dst.read_bytes() == src.read_bytes()
+    assert os.stat(dst).st_mode == os.stat(src).st_mode
+    assert os.stat(dst).st_mtime_ns == os.stat(src).st_mtime_ns
+
+
+def test_fast_copy_falls_back_when_kernel_copy_stops_short(monkeypatch, tmp_path):
+    src = tmp_path / "src.yaml"
+    src.write_bytes(os.urandom(50_000))
+    dst = tmp_path / "dst.yaml"
+    real_copy_file_range = getattr(os, "copy_file_range", None)
+    calls = []
+
+    def short_copy_file_range(src_fd, dst_fd, count, *args):
+        # Copy a little, then report EOF long before the end of the file
+        calls.append(count)
+        if len(calls) > 1:
+            return 0
+        if real_copy_file_range is not None:
+            return real_copy_file_range(src_fd, dst_fd, min(count, 1000))
+        return os.write(dst_fd, os.read(src_fd, min(count, 1000)))
+
+    monkeypatch.setattr(os, "copy_file_range", short_copy_file_range, raising=False)
+
+    backup_utils._fast_copy(str(src), str(dst))
+
+    assert len(calls) == 2
+    assert dst.read_bytes() == src.read_bytes()
+
+
+def test_list_backups_sees_changes_within_one_mtime_tick(tmp_path):
+    _write_agent(tmp_path, "agent")
+    assert backup_utils.backup_agent_config("agent", str(tmp_path), "first")
+    assert len(backup_utils.list_backups(str(tmp_path))) == 1
+    assert len(backup_utils.list_backups(str(tmp_path), "agent")) == 1
+
+    backup_dir = tmp_path / "backups"
+    mtime_ns = os.stat(backup_dir).st_mtime_ns
+
+    # A second backup in the same mtime tick as the cached scan
+    assert backup_utils._backup_one("agent", str(tmp_path), "second", "20990101_000000")
+    os.utime(backup_dir, ns=(mtime_ns, mtime_ns))
+    assert len(backup_utils.list_backups(str(tmp_path))) == 2
+    assert len(backup_utils.list_backups(str(tmp_path), "agent")) == 2
+
+    # And a cleanup in the same tick again
+    assert backup_utils.cleanup_old_backups(str(tmp_path), keep_count=1) == 1
+    os.utime(backup_dir, ns=(mtime_ns, mtime_ns))
+    assert len(backup_utils.list_backups(str(tmp_path))) == 1
+    assert len(backup_utils.list_backups(str(tmp_path), "agent")) == 1
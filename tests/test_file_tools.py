@@ -0,0 +1,29 @@
+"""Regression tests for file tool parameter handling."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("google.adk")
+
+from tools.file_tools import _max_read_bytes_error, FileReaderTool, MultiFileReaderTool
+
+
+@pytest.mark.parametrize("value", [None, 0, 1, 4096])
+def test_max_read_bytes_accepts_none_and_non_negative_ints(value):
+    assert _max_read_bytes_error(value) is None
+
+
+@pytest.mark.parametrize("value", [-1, "10", 1.5, True, [1]])
+def test_max_read_bytes_rejects_other_values(value):
+    assert "error" in _max_read_bytes_error(value)
+
+
+@pytest.mark.parametrize("tool_class,params", [
+    (FileReaderTool, {"path": "notes.txt"}),
+    (MultiFileReaderTool, {"paths": ["notes.txt"]}),
+])
+def test_readers_return_an_error_for_non_integer_max_read_bytes(tmp_path, tool_class, params):
+    tool = tool_class(name="reader", description="Read files", allowed_directories=[str(tmp_path)])
+    result = asyncio.run(tool._execute({**params, "max_read_bytes": "10"}))
+    assert result == {"error": "max_read_bytes must be an integer: '10'"}
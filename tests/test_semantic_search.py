@@ -0,0 +1,146 @@
+"""Regression tests for SemanticSearchTool chunking and ChromaDB batching."""
+
+import hashlib
+import io
+import logging
+import os
+import random
+import threading
+
+import pytest
+
+pytest.importorskip("chromadb")
+pytest.importorskip("google.adk")
+
+from tools import semantic_search
+from tools.semantic_search import SemanticSearchConfig, SemanticSearchTool
+
+
+def _legacy_chunk_text(text, chunk_size, overlap):
+    """SemanticSearchTool._chunk_text as it was before chunking was streamed."""
+    chunks = []
+    if len(text) <= chunk_size:
+        return [text]
+    start = 0
+    while start < len(text):
+        end = start + chunk_size
+        chunks.append(text[start:end])
+        if end >= len(text):
+            break
+        start = end - overlap
+    return chunks
+
+
+def _make_tool(**config):
+    """Build the tool around a parsed config, without a ChromaDB client or background indexing."""
+    tool = object.__new__(SemanticSearchTool)
+    tool.tool_config = SemanticSearchConfig(**config)
+    tool._extensions = frozenset(ext.lower() for ext in tool.tool_config.file_extensions)
+    tool.logger = logging.getLogger("test_semantic_search")
+    return tool
+
+
+@pytest.mark.parametrize("chunk_size,overlap", [(100, 0), (100, 20), (150, 99), (400, 200)])
+@pytest.mark.parametrize("read_size", [1, 7, 64, 64 * 1024])
+def test_stream_chunker_matches_legacy_chunk_text(monkeypatch, tmp_path, chunk_size, overlap, read_size):
+    monkeypatch.setattr(semantic_search, "_STREAM_READ_SIZE", read_size)
+    tool = _make_tool(
+        scan_directory=str(tmp_path),
+        chunk_size=chunk_size,
+        chunk_overlap=overlap,
+        chunk_boundary_window=0
+    )
+    rng = random.Random(chunk_size * 1000 + overlap * 10 + read_size)
+
+    for length in (0, 1, chunk_size - 1, chunk_size, chunk_size + 1, 3 * chunk_size, 1234):
+        text = "".join(rng.choice("ab c\n\r€漢") for _ in range(length))
+        raw = text.encode("utf-8")
+        # The legacy reader opened files in text mode, translating newlines
+        expected = _legacy_chunk_text(io.StringIO(text, newline=None).read(), chunk_size, overlap)
+
+        digest = hashlib.sha256()
+        chunks = [chunk for chunk, _ in tool._chunk_file_stream(io.BytesIO(raw), digest)]
+        assert chunks == expected
+        assert digest.digest() == hashlib.sha256(raw).digest()
+
+
+class _FakeCollection:
+    """Collection that stores records in a dict and rejects calls above max_batch_size."""
+
+    def __init__(self, max_batch_size):
+        self.max_batch_size = max_batch_size
+        self.records = {}
+        self.calls = []
+
+    def _check(self, op, ids):
+        self.calls.append((op, len(ids)))
+        if len(ids) > self.max_batch_size:
+            raise ValueError(f"Cannot submit more than {self.max_batch_size} embeddings at once")
+
+    def get(self, include):
+        return {"ids": list(self.records), "metadatas": [m for _, m in self.records.values()]}
+
+    def upsert(self, documents, metadatas, ids, embeddings):
+        self._check("upsert", ids)
+        for document, metadata, chunk_id in zip(documents, metadatas, ids):
+            self.records[chunk_id] = (document, metadata)
+
+    def update(self, ids, metadatas):
+        self._check("update", ids)
+        for chunk_id, metadata in zip(ids, metadatas):
+            self.records[chunk_id] = (self.records[chunk_id][0], metadata)
+
+    def delete(self, ids):
+        self._check("delete", ids)
+        for chunk_id in ids:
+            del self.records[chunk_id]
+
+
+class _FakeClient:
+    def __init__(self, max_batch_size):
+        self.max_batch_size = max_batch_size
+
+
+class _FakeEmbeddingProvider:
+    def embed_texts(self, texts):
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+def _run_indexing(tool):
+    tool._indexing_ready = threading.Event()
+    tool._indexing_finished = threading.Event()
+    tool._index_directory()
+    return tool._indexing_ready.is_set()
+
+
+def test_indexing_batches_writes_above_max_batch_size(tmp_path):
+    max_batch_size = 7
+    for i in range(12):
+        (tmp_path / f"doc{i}.txt").write_text(f"line {i} " * 40 + "\n" + "more text\n" * 30)
+
+    tool = _make_tool(scan_directory=str(tmp_path), chunk_size=100, chunk_overlap=10, chroma_batch_size=50)
+    tool.collection = _FakeCollection(max_batch_size)
+    tool.chroma_client = _FakeClient(max_batch_size)
+    tool.embedding_provider = _FakeEmbeddingProvider()
+    tool._max_pending_writes = 1
+
+    # Chunks of a file that no longer exists, e.g. ids from an older id scheme
+    for i in range(40):
+        tool.collection.records[f"legacy_{i}"] = ("old", {"file_path": str(tmp_path / "gone.txt")})
+
+    assert _run_indexing(tool)
+    assert not any(chunk_id.startswith("legacy_") for chunk_id in tool.collection.records)
+    indexed = len(tool.collection.records)
+    assert indexed > max_batch_size
+    ops = {op for op, _ in tool.collection.calls}
+    assert {"upsert", "delete"} <= ops
+
+    # Touched but unchanged files only get their metadata refreshed
+    tool.collection.calls.clear()
+    for path in tmp_path.glob("*.txt"):
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert _run_indexing(tool)
+    assert len(tool.collection.records) == indexed
+    assert {op for op, _ in tool.collection.calls} == {"update"}
+    assert sum(size for _, size in tool.collection.calls) == indexed
@@ -0,0 +1,32 @@
+"""Regression tests for terminal command placeholder substitution."""
+
+import re
+import shlex
+
+import pytest
+
+pytest.importorskip("google.adk")
+
+from tools.terminal_tools import TerminalCommandTool
+
+
+def _regex_replace_placeholders(template, params):
+    """The placeholder substitution used before templates went through str.format_map."""
+    def replace(match):
+        key = match.group(1)
+        if key not in params:
+            return match.group(0)
+        return shlex.quote(str(params[key]))
+    return re.sub(r'\{(\w+)\}', replace, template)
+
+
+@pytest.mark.parametrize("template,params", [
+    ("echo {1}", {"1": "x"}),
+    ("echo {name} {1} {missing}", {"name": "a b", "1": "it's"}),
+    ("awk '{print $1}' {file}", {"file": "log.txt"}),
+    ("echo {{name}} {name}}", {"name": "{name}"}),
+    ("printf '%s' {0abc} {é}", {"0abc": ";rm -rf /", "é": "x"}),
+])
+def test_replace_placeholders_matches_regex_substitution(template, params):
+    tool = TerminalCommandTool(name="terminal", description="Run commands")
+    assert tool._replace_placeholders(template, params) == _regex_replace_placeholders(template, params)
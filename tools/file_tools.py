@@ -1,12 +1,25 @@
 """Example tools for AI agents."""
 
-from typing import Dict, Any, List
+import asyncio
+import base64
+import codecs
+import fnmatch
+import logging
+import operator
+import os
+import re
+import stat
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
 from pydantic import BaseModel, Field
 
 from core.tool_creation.tool_factories import BaseFunctionToolFactory
 from core.tool_creation.models import ToolParam
 
 
+logger = logging.getLogger(__name__)
+
+
 class FileReaderConfig(BaseModel):
     """Configuration for file reader tool."""
     allowed_extensions: List[str] = Field(
@@ -27,6 +40,10 @@ class FileReaderConfig(BaseModel):
         default=True,
         description="Whether to allow reading files from subdirectories of allowed directories"
     )
+    binary_mode: bool = Field(
+        default=False,
+        description="Whether to always return raw file bytes base64-encoded instead of decoded text"
+    )
 
     # LLM callable parameters definition
     params: List[ToolParam] = Field(
@@ -40,17 +57,147 @@ class FileReaderConfig(BaseModel):
             ToolParam(
                 name="encoding",
                 type="string",
-                description="File encoding",
+                description="File encoding, or 'binary' for base64-encoded raw bytes",
+                default="utf-8",
+                required=False
+            ),
+            ToolParam(
+                name="max_read_bytes",
+                type="integer",
+                description="Maximum number of bytes to read from the start of the file (optional)",
+                required=False
+            )
+        ],
+        description="Parameters that the LLM can use when calling this tool"
+    )
+
+
+class MultiFileReaderConfig(FileReaderConfig):
+    """Configuration for multi-file reader tool."""
+    max_files: int = Field(
+        default=20,
+        ge=1,
+        description="Maximum number of files that can be read in one call"
+    )
+
+    # LLM callable parameters definition
+    params: List[ToolParam] = Field(
+        default=[
+            ToolParam(
+                name="paths",
+                type="list",
+                description="Paths of the files to read",
+                required=True
+            ),
+            ToolParam(
+                name="encoding",
+                type="string",
+                description="File encoding, or 'binary' for base64-encoded raw bytes",
                 default="utf-8",
                 required=False
+            ),
+            ToolParam(
+                name="max_read_bytes",
+                type="integer",
+                description="Maximum number of bytes to read from the start of each file (optional)",
+                required=False
             )
         ],
         description="Parameters that the LLM can use when calling this tool"
     )
 
+
+# Bytes sniffed from the start of a file to detect binary content
+_BINARY_PEEK_BYTES = 4096
+
+# Encoding parameter value that requests raw bytes instead of text
+_BINARY_ENCODING = "binary"
+
+
+def _max_read_bytes_error(max_read_bytes: Any) -> Optional[Dict[str, Any]]:
+    """Return an error result unless max_read_bytes is None or a non-negative integer."""
+    if max_read_bytes is None:
+        return None
+    if isinstance(max_read_bytes, bool) or not isinstance(max_read_bytes, int):
+        return {"error": f"max_read_bytes must be an integer: {max_read_bytes!r}"}
+    if max_read_bytes < 0:
+        return {"error": f"max_read_bytes must not be negative: {max_read_bytes}"}
+    return None
+
+
+def _read_binary_file(path, max_read_bytes: Optional[int] = None) -> Tuple[str, bool]:
+    """
+    Read a file's raw bytes, optionally only its first max_read_bytes bytes.
+    
+    Args:
+        path: Path of the file to read
+        max_read_bytes: Optional limit on the number of bytes read
+        
+    Returns:
+        Tuple of (base64-encoded content, truncated)
+    """
+    with open(path, 'rb', buffering=0) as f:
+        if max_read_bytes is None:
+            data = f.readall()
+            truncated = False
+        else:
+            data = f.read(max_read_bytes + 1)
+            truncated = len(data) > max_read_bytes
+            data = data[:max_read_bytes]
+    
+    # No decoding pass: bytes go straight to base64
+    return base64.b64encode(data).decode('ascii'), truncated
+
+
+def _read_text_file(path, encoding: str, max_read_bytes: Optional[int] = None) -> Optional[Tuple[str, bool]]:
+    """
+    Read a text file, optionally only its first max_read_bytes bytes.
+    
+    Args:
+        path: Path of the file to read
+        encoding: Text encoding of the file
+        max_read_bytes: Optional limit on the number of bytes read
+        
+    Returns:
+        Tuple of (content, truncated), or None if the file looks binary
+    """
+    # NUL bytes are normal in UTF-16/32 text, so only sniff byte-oriented encodings
+    sniff_binary = not codecs.lookup(encoding).name.startswith(('utf-16', 'utf-32'))
+    
+    # Unbuffered: reads go straight into the result bytes without an
+    # intermediate BufferedReader copy, and readall() sizes itself via fstat
+    with open(path, 'rb', buffering=0) as f:
+        if sniff_binary and b'\0' in f.read(_BINARY_PEEK_BYTES):
+            return None
+        f.seek(0)
+        
+        if max_read_bytes is None:
+            data = f.readall()
+            truncated = False
+        else:
+            data = f.read(max_read_bytes + 1)
+            truncated = len(data) > max_read_bytes
+            data = data[:max_read_bytes]
+    
+    if truncated:
+        # A truncated read may end inside a multi-byte character; the incremental
+        # decoder drops that partial tail instead of raising
+        content = codecs.getincrementaldecoder(encoding)().decode(data, final=False)
+    else:
+        # Whole files decode in one call, which hits the codec's bulk fast path
+        content = data.decode(encoding)
+    # Match the newline translation of text-mode reads, skipping the copies
+    # for the common case of files with no carriage returns
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content, truncated
+
+
 class FileReaderTool(BaseFunctionToolFactory):
     """Tool for reading files."""
 
+    __slots__ = ("tool_config", "_allowed_exts", "_resolved_allowed_dirs", "_allowed_dirs_str", "_allowed_prefixes")
+
     # Static Pydantic data model for this tool
     data_model = FileReaderConfig
 
@@ -58,86 +205,130 @@ class FileReaderTool(BaseFunctionToolFactory):
         super().__init__(name, description, **config)
         # Validate configuration using the static data model
         self.tool_config = self.data_model(**config)
+        # Normalized once so suffix checks are case-insensitive set lookups
+        self._allowed_exts = frozenset(ext.lower() for ext in self.tool_config.allowed_extensions)
+
+        # Allowed directories are static config, so resolve them once
+        resolved_dirs = [Path(d).resolve() for d in self.tool_config.allowed_directories]
+        self._resolved_allowed_dirs = []
+        for allowed_dir_path in resolved_dirs:
+            # Additional security: ensure allowed directory exists
+            if allowed_dir_path.exists():
+                self._resolved_allowed_dirs.append(allowed_dir_path)
+            else:
+                logger.warning("Allowed directory does not exist: %s", allowed_dir_path)
+        self._allowed_dirs_str = ", ".join(str(p) for p in resolved_dirs)
+        # (dir, dir + separator) pairs for plain string containment checks
+        self._allowed_prefixes = tuple(
+            (root, root if root.endswith(os.sep) else root + os.sep)
+            for root in map(str, self._resolved_allowed_dirs)
+        )
 
     async def _execute(self, params) -> Any:
         """Read file content."""
+        file_path = params.get("path")
+        encoding = params.get("encoding", "utf-8")
+        max_read_bytes = params.get("max_read_bytes")
+        error = _max_read_bytes_error(max_read_bytes)
+        if error is not None:
+            return error
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Reading file: %s", params)
+
+        return await self._read_file(file_path, encoding, max_read_bytes)
+
+    async def _read_file(self, file_path: str, encoding: str, max_read_bytes: Optional[int]) -> Dict[str, Any]:
+        """
+        Check one file against the access rules and read it.
+        
+        Args:
+            file_path: Path of the file to read
+            encoding: Text encoding, or "binary" for base64-encoded raw bytes
+            max_read_bytes: Optional limit on the number of bytes read
+            
+        Returns:
+            Dict with the file content, or with an "error" key
+        """
         allowed_extensions = self.tool_config.allowed_extensions
         max_size_mb = self.tool_config.max_size_mb
-        allowed_directories = self.tool_config.allowed_directories
         allow_subdirectories = self.tool_config.allow_subdirectories
 
         try:
-            from pathlib import Path
-            import os
-
-            file_path = params.get("path")
-            encoding = params.get("encoding", "utf-8")
-
-            print(f"Reading file: {params}")
-
-            file_path_obj = Path(file_path).resolve()  # Resolve to absolute path
-
             # Security checks
-            if not file_path_obj.exists():
+            # One stat answers existence, file type and size; the kernel follows
+            # the same symlinks resolve() would, so missing paths and non-files
+            # are rejected before paying for resolution
+            try:
+                file_stat = os.stat(file_path)
+            except (FileNotFoundError, NotADirectoryError):
                 return {"error": f"File not found: {file_path}"}
 
-            if not file_path_obj.is_file():
+            if not stat.S_ISREG(file_stat.st_mode):
                 return {"error": f"Path is not a file: {file_path}"}
 
+            file_path_obj = Path(file_path).resolve()  # Resolve to absolute path
+
             # Directory access control - prevent path traversal attacks
             allowed = False
             resolved_file_path = str(file_path_obj)
 
-            for allowed_dir in allowed_directories:
-                allowed_dir_path = Path(allowed_dir).resolve()
-
-                # Additional security: ensure allowed directory exists
-                if not allowed_dir_path.exists():
-                    print(f"Warning: Allowed directory does not exist: {allowed_dir_path}")
-                    continue
-
+            # Both sides are resolved (absolute, normalized, no '..'), so containment
+            # is a string prefix check; this still stops traversal like
+            # /opt/data/../../root/file.txt because resolve() has collapsed it
+            parent_dir = os.path.dirname(resolved_file_path)
+            for root, root_sep in self._allowed_prefixes:
                 if allow_subdirectories:
                     # Check if file is within allowed directory or its subdirectories
-                    # This prevents path traversal attacks like /opt/data/../../root/file.txt
-                    try:
-                        relative_path = file_path_obj.relative_to(allowed_dir_path)
-                        # Additional check: ensure no upward traversal in the relative path
-                        if '..' not in str(relative_path):
-                            allowed = True
-                            print(f"File access granted: {resolved_file_path} is within {allowed_dir_path}")
-                            break
-                    except ValueError:
-                        # Not within this allowed directory
-                        continue
+                    if resolved_file_path.startswith(root_sep):
+                        allowed = True
+                        logger.debug("File access granted: %s is within %s", resolved_file_path, root)
+                        break
                 else:
                     # Check if file is directly in allowed directory (no subdirectories)
-                    if file_path_obj.parent == allowed_dir_path:
+                    if parent_dir == root:
                         allowed = True
-                        print(f"File access granted: {resolved_file_path} is directly in {allowed_dir_path}")
+                        logger.debug("File access granted: %s is directly in %s", resolved_file_path, root)
                         break
 
             if not allowed:
-                allowed_dirs_str = ", ".join([str(Path(d).resolve()) for d in allowed_directories])
+                allowed_dirs_str = self._allowed_dirs_str
                 subdir_msg = " or their subdirectories" if allow_subdirectories else ""
-                print(f"File access denied: {resolved_file_path} not in allowed directories")
+                logger.info("File access denied: %s not in allowed directories", resolved_file_path)
                 return {"error": f"File access denied. File must be within allowed directories: {allowed_dirs_str}{subdir_msg}. Resolved path: {resolved_file_path}"}
 
-            if file_path_obj.suffix.lower() not in allowed_extensions:
+            if file_path_obj.suffix.lower() not in self._allowed_exts:
                 return {"error": f"File extension not allowed: {file_path_obj.suffix}. The following extensions are allowed: {allowed_extensions}"}
 
-            file_size_mb = file_path_obj.stat().st_size / (1024 * 1024)
+            size_bytes = file_stat.st_size
+            file_size_mb = size_bytes / (1024 * 1024)
             if file_size_mb > max_size_mb:
                 return {"error": f"File too large: {file_size_mb:.2f}MB > {max_size_mb}MB"}
 
-            # Read file
-            with open(file_path_obj, 'r', encoding=encoding) as f:
-                content = f.read()
+            if self.tool_config.binary_mode or encoding == _BINARY_ENCODING:
+                content_b64, truncated = await asyncio.to_thread(
+                    _read_binary_file, file_path_obj, max_read_bytes
+                )
+                return {
+                    "file_path": str(file_path_obj),
+                    "size_bytes": size_bytes,
+                    "encoding": _BINARY_ENCODING,
+                    "content_b64": content_b64,
+                    "truncated": truncated
+                }
+
+            # Read file in a worker thread so the event loop keeps serving other calls
+            result = await asyncio.to_thread(_read_text_file, file_path_obj, encoding, max_read_bytes)
+            if result is None:
+                return {"error": f"File appears to be binary: {file_path}"}
+            content, truncated = result
 
             return {
                 "file_path": str(file_path_obj),
-                "size_bytes": file_path_obj.stat().st_size,
+                "size_bytes": size_bytes,
                 "encoding": encoding,
-                "content": content
+                "content": content,
+                "truncated": truncated
             }
         except Exception as e:
             return {"error": str(e)}
@@ -186,33 +377,104 @@ class FileReaderTool(BaseFunctionToolFactory):
         return cls.data_model(**config)
 
 
+class MultiFileReaderTool(FileReaderTool):
+    """Tool for reading several files in one call."""
+
+    __slots__ = ()
+
+    # Static Pydantic data model for this tool
+    data_model = MultiFileReaderConfig
+
+    async def _execute(self, params) -> Any:
+        """Read the content of several files concurrently."""
+        paths = params.get("paths") or []
+        encoding = params.get("encoding", "utf-8")
+        max_read_bytes = params.get("max_read_bytes")
+        max_files = self.tool_config.max_files
+
+        if not isinstance(paths, list):
+            return {"error": "paths must be a list of file paths"}
+        if len(paths) > max_files:
+            return {"error": f"Too many files requested: {len(paths)} > {max_files}"}
+        error = _max_read_bytes_error(max_read_bytes)
+        if error is not None:
+            return error
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Reading files: %s", params)
+
+        # Each read runs in its own worker thread, so the files are read in parallel
+        # and results come back in request order; failures stay per file
+        results = await asyncio.gather(
+            *(self._read_file(file_path, encoding, max_read_bytes) for file_path in paths)
+        )
+        files = [{"path": file_path, **result} for file_path, result in zip(paths, results)]
+
+        return {
+            "files": files,
+            "file_count": len(files),
+            "error_count": sum(1 for result in files if "error" in result)
+        }
+
+
+def _ext(name: str) -> str:
+    """Lower-cased file extension of a name, following the same rules as PurePath.suffix."""
+    i = name.rfind('.')
+    return name[i:].lower() if 0 < i < len(name) - 1 else ''
+
+
+# Directories read in parallel by a recursive DirectoryListTool listing
+_MAX_CONCURRENT_SCANS = 16
+
+# Default bounds of a recursive listing: levels below the listed directory and
+# directory entries read, so filters that match nothing cannot walk a whole tree
+_DEFAULT_MAX_DEPTH = 10
+_DEFAULT_MAX_SCANNED_ENTRIES = 10000
+
+
 class DirectoryListTool(BaseFunctionToolFactory):
     """Tool for listing files and folders in a directory."""
     
+    __slots__ = ("_allowed_exts", "_excluded_re", "_show_hidden")
+    
+    def __init__(self, name: str, description: str, **config):
+        super().__init__(name, description, **config)
+        # Static filters are normalized and compiled once per tool, not per call
+        allowed_extensions = config.get("allowed_extensions", None)  # None means allow all
+        self._allowed_exts = frozenset(ext.lower() for ext in allowed_extensions) if allowed_extensions else None
+        excluded_patterns = config.get("excluded_patterns", [])  # Patterns to exclude
+        # One alternation regex tests every excluded pattern in a single match
+        self._excluded_re = (
+            re.compile("|".join(fnmatch.translate(pattern) for pattern in excluded_patterns))
+            if excluded_patterns else None
+        )
+        self._show_hidden = bool(config.get("show_hidden", False))  # Show hidden files/folders
+    
     async def _execute(self, params) -> Any:
         """List directory contents with safety limit and filtering."""
         max_items = self.config.get("max_items", 100)  # Default max items is 100
         root_path = self.config.get("root_path", ".")  # Default to current directory
+        max_depth = self.config.get("max_depth", _DEFAULT_MAX_DEPTH)  # Subdirectory levels when recursing
+        max_scanned = self.config.get("max_scanned_entries", _DEFAULT_MAX_SCANNED_ENTRIES)  # Entries read when recursing
         
         # Filter configuration
-        allowed_extensions = self.config.get("allowed_extensions", None)  # None means allow all
-        excluded_patterns = self.config.get("excluded_patterns", [])  # Patterns to exclude
-        show_hidden = self.config.get("show_hidden", False)  # Show hidden files/folders
+        allowed_extensions = self.config.get("allowed_extensions", None)
+        excluded_patterns = self.config.get("excluded_patterns", [])
+        show_hidden = self._show_hidden
+        excluded_re = self._excluded_re
+        allowed_ext_set = self._allowed_exts
         
         # Runtime filter parameters
         filter_type = params.get("filter_type", "all")  # "all", "files", "directories"
         name_pattern = params.get("name_pattern", None)  # Pattern to match names
+        recursive = bool(params.get("recursive", False))  # Descend into subdirectories
 
         try:
-            from pathlib import Path
-            import os
-            import fnmatch
-            import re
-
             # Use provided path or fall back to configured root path
             directory_path = params.get("path", root_path)
             
-            print(f"Listing directory: {params}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Listing directory: %s", params)
 
             dir_path_obj = Path(directory_path)
             
@@ -223,73 +485,147 @@ class DirectoryListTool(BaseFunctionToolFactory):
             if not dir_path_obj.is_dir():
                 return {"error": f"Path is not a directory: {directory_path}"}
 
-            # Helper function to check if item should be filtered
-            def should_include_item(item_path):
-                item_name = item_path.name
+            # Compile the name filter once instead of per item
+            name_re = re.compile(fnmatch.translate(name_pattern.lower())) if name_pattern else None
+
+            # Helper function to check if item should be filtered; checks run
+            # cheapest first so most rejections never reach the regexes
+            def should_include_item(entry, is_file):
+                item_name = entry.name
                 
                 # Check hidden files
-                if not show_hidden and item_name.startswith('.'):
+                if not show_hidden and item_name[0] == '.':
                     return False
                 
-                # Check excluded patterns
-                for pattern in excluded_patterns:
-                    if fnmatch.fnmatch(item_name, pattern):
-                        return False
-                
-                # Check name pattern if provided
-                if name_pattern:
-                    if not fnmatch.fnmatch(item_name.lower(), name_pattern.lower()):
-                        return False
+                # Check filter type
+                if filter_type == "files" and not is_file:
+                    return False
+                elif filter_type == "directories" and not entry.is_dir():
+                    return False
                 
                 # Check file extension filter
-                if item_path.is_file() and allowed_extensions:
-                    if item_path.suffix.lower() not in [ext.lower() for ext in allowed_extensions]:
+                if allowed_ext_set is not None and is_file:
+                    if _ext(item_name) not in allowed_ext_set:
                         return False
                 
-                # Check filter type
-                if filter_type == "files" and not item_path.is_file():
+                # Check excluded patterns
+                if excluded_re is not None and excluded_re.match(item_name):
                     return False
-                elif filter_type == "directories" and not item_path.is_dir():
+                
+                # Check name pattern if provided
+                if name_re is not None and not name_re.match(item_name.lower()):
                     return False
                 
                 return True
 
-            # List directory contents
-            items = []
-            item_count = 0
-            total_items_scanned = 0
+            # Item paths are reported the way Path would join them
+            base_path = str(dir_path_obj)
+            
+            # List one directory's contents (runs in a worker thread). Also
+            # returns the subdirectories to descend into when recursing.
+            def scan_directory(scan_path, limit, scan_limit):
+                items = []
+                subdirs = []
+                total_items_scanned = 0
+                
+                # DirEntry caches the file type from the directory read, so
+                # is_file/is_dir normally cost no extra syscalls
+                with os.scandir(scan_path) as entries:
+                    for entry in entries:
+                        # Stop before paying for any filtering once a limit is reached
+                        if len(items) >= limit or total_items_scanned >= scan_limit:
+                            break
+                        
+                        total_items_scanned += 1
+                        item_path = entry.name if scan_path == "." else entry.path
+                        
+                        # Symlinked directories are not followed to avoid cycles
+                        if (recursive
+                                and entry.is_dir(follow_symlinks=False)
+                                and (show_hidden or entry.name[0] != '.')
+                                and not (excluded_re is not None and excluded_re.match(entry.name))):
+                            subdirs.append(item_path)
+                        
+                        is_file = entry.is_file()
+                        if not should_include_item(entry, is_file):
+                            continue
+                        
+                        is_dir = entry.is_dir()
+                        item_info = {
+                            "name": entry.name,
+                            "path": item_path,
+                            "is_directory": is_dir,
+                            "is_file": is_file
+                        }
+                        
+                        # Add size info for files
+                        if is_file:
+                            extension = _ext(entry.name)
+                            try:
+                                item_info["size_bytes"] = entry.stat().st_size
+                                item_info["extension"] = extension
+                            except (OSError, PermissionError):
+                                item_info["size_bytes"] = None
+                                item_info["extension"] = extension
+                        
+                        # Carry the sort key along so sorting does no per-comparison work:
+                        # directories first, then files, both alphabetically
+                        sort_name = item_path if recursive else entry.name
+                        items.append(((not is_dir, sort_name.lower()), item_info))
+                
+                return items, subdirs, total_items_scanned
+            
+            # Bounds the number of directories read concurrently when recursing
+            scan_slots = asyncio.Semaphore(_MAX_CONCURRENT_SCANS)
+            
+            # Entries read so far; updated on the event loop as each directory finishes
+            scanned = [0]
+            
+            async def scan_subdirectory(scan_path, limit):
+                async with scan_slots:
+                    scan_limit = max_scanned - scanned[0]
+                    if scan_limit <= 0:
+                        return [], [], 0
+                    try:
+                        result = await asyncio.to_thread(scan_directory, scan_path, limit, scan_limit)
+                    except OSError:
+                        # Unreadable or vanished subdirectories are skipped rather than failing the listing
+                        return [], [], 0
+                    scanned[0] += result[2]
+                    return result
             
             try:
-                for item in dir_path_obj.iterdir():
-                    total_items_scanned += 1
-                    
-                    if not should_include_item(item):
-                        continue
-                    
-                    if item_count >= max_items:
+                # Directory reads block, so keep them off the event loop
+                items, subdirs, total_items_scanned = await asyncio.to_thread(
+                    scan_directory, base_path, max_items, max_scanned if recursive else float("inf")
+                )
+                scanned[0] = total_items_scanned
+                
+                # Walk the tree level by level, reading each level's directories concurrently
+                depth = 0
+                scan_limit_reached = False
+                while subdirs and len(items) < max_items:
+                    if depth >= max_depth or scanned[0] >= max_scanned:
+                        scan_limit_reached = True
                         break
-                    
-                    item_info = {
-                        "name": item.name,
-                        "path": str(item),
-                        "is_directory": item.is_dir(),
-                        "is_file": item.is_file()
-                    }
-                    
-                    # Add size info for files
-                    if item.is_file():
-                        try:
-                            item_info["size_bytes"] = item.stat().st_size
-                            item_info["extension"] = item.suffix.lower()
-                        except (OSError, PermissionError):
-                            item_info["size_bytes"] = None
-                            item_info["extension"] = item.suffix.lower()
-                    
-                    items.append(item_info)
-                    item_count += 1
+                    depth += 1
+                    remaining = max_items - len(items)
+                    results = await asyncio.gather(
+                        *(scan_subdirectory(subdir, remaining) for subdir in subdirs)
+                    )
+                    subdirs = []
+                    for level_items, level_subdirs, level_scanned in results:
+                        items.extend(level_items)
+                        subdirs.extend(level_subdirs)
+                        total_items_scanned += level_scanned
+                # Directories may also have been cut short by the entry bound
+                if recursive and scanned[0] >= max_scanned:
+                    scan_limit_reached = True
+                del items[max_items:]
+                item_count = len(items)
                 
-                # Sort items: directories first, then files, both alphabetically
-                items.sort(key=lambda x: (not x["is_directory"], x["name"].lower()))
+                items.sort(key=operator.itemgetter(0))
+                items = [item_info for _, item_info in items]
                 
                 return {
                     "directory_path": str(dir_path_obj.absolute()),
@@ -297,12 +633,14 @@ class DirectoryListTool(BaseFunctionToolFactory):
                     "total_items_found": item_count,
                     "max_items_limit": max_items,
                     "truncated": item_count >= max_items,
+                    "scan_limit_reached": scan_limit_reached,
                     "filter_applied": {
                         "filter_type": filter_type,
                         "name_pattern": name_pattern,
                         "allowed_extensions": allowed_extensions,
                         "excluded_patterns": excluded_patterns,
-                        "show_hidden": show_hidden
+                        "show_hidden": show_hidden,
+                        "recursive": recursive
                     },
                     "items": items
                 }
@@ -330,6 +668,11 @@ class DirectoryListTool(BaseFunctionToolFactory):
                 "name_pattern": {
                     "type": "string",
                     "description": "Pattern to match file/folder names (supports wildcards like *.txt)"
+                },
+                "recursive": {
+                    "type": "boolean",
+                    "description": "Whether to include the contents of subdirectories",
+                    "default": False
                 }
             },
             "required": []
@@ -2,16 +2,121 @@ try:
     import cx_Oracle
 except ImportError:
     cx_Oracle = None
+import asyncio
+import functools
+import logging
 import re
-from typing import Dict, Any, List, Optional, Union
+import threading
+from typing import Dict, Any, List, Optional, Tuple, Union
 from pathlib import Path
 
 from core.tool_creation.tool_factories import BaseFunctionToolFactory
 
+logger = logging.getLogger(__name__)
+
+# Matched case-insensitively so queries need no uppercased copy. Keywords are
+# matched as plain substrings (no word boundaries), as the original check was.
+_SELECT_RE = re.compile(r'\s*SELECT', re.IGNORECASE)
+_UNSAFE_RE = re.compile(
+    r'DROP|DELETE|INSERT|UPDATE|ALTER|CREATE|TRUNCATE|GRANT|REVOKE|EXEC|DBMS_|UTL_|SYS\.',
+    re.IGNORECASE
+)
+
+_PLACEHOLDER_RE = re.compile(r'\{(\w+)\}')
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_bind_template(query_template: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Convert a query template to Oracle bind variable syntax.
+    
+    Templates come from static config, so the result is cached per template.
+    
+    Args:
+        query_template: Query with {param_name} placeholders
+        
+    Returns:
+        Tuple of (query with :param_name binds, unique placeholder names in order)
+    """
+    placeholders = tuple(dict.fromkeys(_PLACEHOLDER_RE.findall(query_template)))
+    # Replace {param_name} with :param_name (Oracle bind variable syntax)
+    return _PLACEHOLDER_RE.sub(r':\1', query_template), placeholders
+
+
+def _lob_output_type_handler(cursor, name, default_type, size, precision, scale):
+    """Fetch CLOB/NCLOB columns as str and BLOB columns as bytes instead of LOB locators."""
+    if default_type in (cx_Oracle.DB_TYPE_CLOB, cx_Oracle.DB_TYPE_NCLOB):
+        return cursor.var(cx_Oracle.DB_TYPE_LONG, arraysize=cursor.arraysize)
+    if default_type == cx_Oracle.DB_TYPE_BLOB:
+        return cursor.var(cx_Oracle.DB_TYPE_LONG_RAW, arraysize=cursor.arraysize)
+    return None
+
+
+def _column_layout(description) -> Tuple[Tuple[str, ...], Tuple[int, ...]]:
+    """
+    Derive the result column layout from a cursor description in one pass.
+    
+    Args:
+        description: cursor.description of an executed query (None if it returns no rows)
+        
+    Returns:
+        Tuple of (column names, indexes of date/timestamp columns)
+    """
+    if not description:
+        return (), ()
+    columns = tuple(desc[0] for desc in description)
+    # Column types are known up front, so decide once which need converting
+    datetime_columns = tuple(i for i, desc in enumerate(description) if desc[1] == cx_Oracle.DATETIME)
+    return columns, datetime_columns
+
+
+# Session pools shared by every tool using the same credentials and DSN
+_session_pools: Dict[tuple, Any] = {}
+_session_pools_lock = threading.Lock()
+
+
+def _get_session_pool(connection_config: Dict[str, Any], pool_max: int, wait_timeout: int):
+    """
+    Return the session pool for a connection configuration, creating it on first use.
+    
+    Queries run in worker threads, so more than pool_max may ask for a session at
+    once; those wait up to wait_timeout seconds for one to be released.
+    
+    Args:
+        connection_config: Connection parameters (username, password, dsn)
+        pool_max: Maximum number of sessions if the pool has to be created
+        wait_timeout: Seconds acquire() waits for a free session if the pool has to be created
+        
+    Returns:
+        cx_Oracle.SessionPool shared by all tools with the same connection
+    """
+    key = (connection_config['username'], connection_config['password'], connection_config['dsn'])
+    pool = _session_pools.get(key)
+    if pool is None:
+        with _session_pools_lock:
+            pool = _session_pools.get(key)
+            if pool is None:
+                pool = cx_Oracle.SessionPool(
+                    user=connection_config['username'],
+                    password=connection_config['password'],
+                    dsn=connection_config['dsn'],
+                    min=1,
+                    max=pool_max,
+                    increment=1,
+                    encoding="UTF-8",
+                    threaded=True,
+                    getmode=cx_Oracle.SPOOL_ATTRVAL_TIMEDWAIT,
+                    waitTimeout=wait_timeout * 1000  # milliseconds
+                )
+                _session_pools[key] = pool
+    return pool
+
 
 class OracleQueryTool(BaseFunctionToolFactory):
     """Tool for executing parameterized Oracle database queries."""
     
+    __slots__ = ()
+    
     async def _execute(self, params) -> Any:
         """Execute Oracle query with parameter substitution."""
         # Check if cx_Oracle is available
@@ -24,13 +129,15 @@ class OracleQueryTool(BaseFunctionToolFactory):
         query_templates = self.config.get("query_templates", {})  # Pre-defined query templates
         max_rows = self.config.get("max_rows", 1000)  # Maximum rows to return
         timeout = self.config.get("timeout", 30)  # Query timeout in seconds
+        pool_max = self.config.get("pool_max", 4)  # Maximum pooled sessions per connection
         
         try:
             query = params.get("query") if not query_template else None
             template_name = params.get("template_name")
             query_params = params
             
-            print(f"Executing Oracle query: {params}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Executing Oracle query: %s", params)
 
             # Determine the query to execute
             if query_template:
@@ -69,7 +176,8 @@ class OracleQueryTool(BaseFunctionToolFactory):
                 bind_params,
                 connection_config,
                 max_rows,
-                timeout
+                timeout,
+                pool_max
             )
             
             return result
@@ -79,18 +187,13 @@ class OracleQueryTool(BaseFunctionToolFactory):
 
     def _prepare_query_with_binds(self, query_template: str, params: Dict[str, Any]) -> tuple[str, Dict[str, Any]]:
         """Convert placeholders to bind variables and return query with bind parameters."""
-        query = query_template
+        query, placeholders = _compile_bind_template(query_template)
         bind_params = {}
         
-        # Find all placeholders like {param_name} and convert to :param_name
-        placeholders = re.findall(r'\{(\w+)\}', query_template)
-        
         for placeholder in placeholders:
             if placeholder not in params:
                 raise ValueError(f"Missing required parameter: {placeholder}")
             
-            # Replace {param_name} with :param_name (Oracle bind variable syntax)
-            query = query.replace(f"{{{placeholder}}}", f":{placeholder}")
             # Store the actual parameter value
             bind_params[placeholder] = params[placeholder]
         
@@ -98,25 +201,9 @@ class OracleQueryTool(BaseFunctionToolFactory):
 
     def _is_query_safe(self, query: str) -> bool:
         """Basic safety check for SQL queries."""
-        # Convert to uppercase for checking
-        query_upper = query.upper().strip()
-        
-        # Only allow SELECT statements for safety
-        if not query_upper.startswith('SELECT'):
-            return False
-        
-        # Check for dangerous keywords
-        dangerous_keywords = [
-            'DROP', 'DELETE', 'INSERT', 'UPDATE', 'ALTER', 'CREATE',
-            'TRUNCATE', 'GRANT', 'REVOKE', 'EXEC', 'EXECUTE',
-            'DBMS_', 'UTL_', 'SYS.'
-        ]
-        
-        for keyword in dangerous_keywords:
-            if keyword in query_upper:
-                return False
-        
-        return True
+        # Only allow SELECT statements for safety, and reject any dangerous
+        # keyword anywhere in the query
+        return bool(_SELECT_RE.match(query)) and not _UNSAFE_RE.search(query)
 
     def _validate_connection_config(self, connection_config: Dict[str, Any]) -> Optional[str]:
         """Validate that required connection parameters are present."""
@@ -134,63 +221,75 @@ class OracleQueryTool(BaseFunctionToolFactory):
         bind_params: Dict[str, Any],
         connection_config: Dict[str, Any],
         max_rows: int,
-        timeout: int
+        timeout: int,
+        pool_max: int = 4
     ) -> Dict[str, Any]:
         """Execute the Oracle query with bind parameters and return results."""
+        # cx_Oracle calls block, so run them off the event loop
+        return await asyncio.to_thread(
+            self._run_query, query, bind_params, connection_config, max_rows, timeout, pool_max
+        )
+
+    def _run_query(
+        self,
+        query: str,
+        bind_params: Dict[str, Any],
+        connection_config: Dict[str, Any],
+        max_rows: int,
+        timeout: int,
+        pool_max: int
+    ) -> Dict[str, Any]:
+        """Synchronously run the query on a pooled connection and collect the results."""
+        pool = None
         connection = None
         try:
-            # Establish connection
-            connection = cx_Oracle.connect(
-                user=connection_config['username'],
-                password=connection_config['password'],
-                dsn=connection_config['dsn'],
-                encoding="UTF-8"
-            )
+            # Acquire a pooled connection instead of connecting per query
+            pool = _get_session_pool(connection_config, pool_max, timeout)
+            connection = pool.acquire()
             
             # Set timeout
             connection.callTimeout = timeout * 1000  # cx_Oracle uses milliseconds
             
-            # Create cursor
-            cursor = connection.cursor()
+            # Create cursor; it is closed before the connection goes back to the pool
+            with connection.cursor() as cursor:
+                # Fetch up to max_rows plus one has-more probe row in one round-trip
+                cursor.arraysize = min(max_rows + 1, 5000)
+                cursor.prefetchrows = cursor.arraysize
+                cursor.outputtypehandler = _lob_output_type_handler
             
-            # Execute query with bind parameters
-            cursor.execute(query, bind_params)
+                # Execute query with bind parameters
+                cursor.execute(query, bind_params)
             
-            # Fetch results
-            columns = [desc[0] for desc in cursor.description] if cursor.description else []
-            rows = cursor.fetchmany(max_rows)
+                # Fetch results
+                columns, datetime_columns = _column_layout(cursor.description)
+                # One extra row tells whether there are more, without a separate fetch
+                rows = cursor.fetchmany(max_rows + 1)
+                has_more = len(rows) > max_rows
+                if has_more:
+                    del rows[max_rows:]
             
-            # Check if there are more rows
-            has_more = len(rows) == max_rows
-            if has_more:
-                # Try to fetch one more row to confirm
-                extra_row = cursor.fetchone()
-                has_more = extra_row is not None
+                # Convert rows to list of dictionaries
+                result_data = []
+                for row in rows:
+                    # Convert Oracle-specific types to JSON-serializable types;
+                    # LOBs already arrive as str/bytes via the output type handler
+                    if datetime_columns:
+                        row = list(row)
+                        for i in datetime_columns:
+                            if row[i] is not None:
+                                row[i] = row[i].isoformat()
+                    result_data.append(dict(zip(columns, row)))
             
-            # Convert rows to list of dictionaries
-            result_data = []
-            for row in rows:
-                row_dict = {}
-                for i, column in enumerate(columns):
-                    value = row[i]
-                    # Convert Oracle-specific types to JSON-serializable types
-                    if hasattr(value, 'read'):  # CLOB/BLOB
-                        value = value.read()
-                    elif hasattr(value, 'isoformat'):  # datetime
-                        value = value.isoformat()
-                    row_dict[column] = value
-                result_data.append(row_dict)
-            
-            return {
-                "query": query,
-                "bind_params": bind_params,
-                "columns": columns,
-                "rows": result_data,
-                "row_count": len(result_data),
-                "has_more_rows": has_more,
-                "max_rows_limit": max_rows,
-                "success": True
-            }
+                return {
+                    "query": query,
+                    "bind_params": bind_params,
+                    "columns": list(columns),
+                    "rows": result_data,
+                    "row_count": len(result_data),
+                    "has_more_rows": has_more,
+                    "max_rows_limit": max_rows,
+                    "success": True
+                }
             
         except cx_Oracle.Error as e:
             error_obj, = e.args
@@ -211,9 +310,9 @@ class OracleQueryTool(BaseFunctionToolFactory):
         finally:
             if connection:
                 try:
-                    connection.close()
-                except:
-                    pass
+                    pool.release(connection)
+                except Exception as e:
+                    logger.warning("Failed to release Oracle connection to the pool: %s", e)
 
     def get_schema(self) -> Dict[str, Any]:
         query_template = self.config.get("query", None)
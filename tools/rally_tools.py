@@ -1,28 +1,235 @@
-from typing import Any, Dict
+import asyncio
+import functools
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from core.tool_creation.tool_factories import BaseFunctionToolFactory
 
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=256)
+def _wrap_query(default_query: str, query: str) -> str:
+    """Combine the configured default query with a caller's query filter."""
+    return f'({default_query} and {query})'
+
+
+# Page size Rally uses when the request does not set one
+_DEFAULT_PAGE_SIZE = 20
+# Upper bound on pages fetched concurrently by one call
+_MAX_PAGES = 10
+
+# Default locations of results and errors in Rally query responses
+_RESULTS_PATH = "QueryResult.Results"
+_ERRORS_PATH = "QueryResult.Errors"
+
+# Both accept the raw response bytes, so the body is never decoded to a str first
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_accessor(path: str) -> Callable[[Any, Any], Any]:
+    """
+    Build a getter for a dot-notation path; paths come from a small static set.
+    
+    Args:
+        path: Dot-separated path (e.g., "QueryResult.Results")
+        
+    Returns:
+        Function (data, default) -> value at the path, or default if not found
+    """
+    keys = tuple(path.split('.'))
+    
+    if len(keys) == 1:
+        key = keys[0]
+        
+        def get_value(data, default):
+            try:
+                return data[key]
+            except (KeyError, TypeError, IndexError):
+                return default
+    else:
+        def get_value(data, default):
+            # Non-dict values along the way (lists, strings, None) raise TypeError
+            try:
+                for key in keys:
+                    data = data[key]
+                return data
+            except (KeyError, TypeError, IndexError):
+                return default
+    
+    return get_value
+
+
+# Shared by all Rally tools so connections (and their TLS sessions) are kept alive
+_session: Optional["aiohttp.ClientSession"] = None
+
+
+def get_session() -> "aiohttp.ClientSession":
+    """
+    Return the shared aiohttp session, creating it on first use.
+    
+    Returns:
+        ClientSession with a pooled connector; per-request headers such as
+        Authorization are passed on each call, not stored on the session
+    """
+    global _session
+    
+    # No await between the check and the assignment, so concurrent callers on
+    # the event loop cannot create two sessions
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, limit_per_host=10, enable_cleanup_closed=True),
+            timeout=aiohttp.ClientTimeout(total=30),
+            headers={"Content-Type": "application/json"}
+        )
+    return _session
+
+
+async def close_session() -> None:
+    """Close the shared aiohttp session, if one was created."""
+    global _session
+    session, _session = _session, None
+    if session is not None and not session.closed:
+        await session.close()
+
+
+# LLM parameter schema; constant, so it is built once at import
+_RALLY_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "endpoint": {
+            "type": "string",
+            "description": "Rally API endpoint (default: portfolioitem/ppmfeature)",
+            "default": "portfolioitem/ppmfeature"
+        },
+        "resultsPath": {
+          "type": "string",
+          "description": "Path to the result in the API response",
+          "default": "QueryResult.Results"
+        },
+        "errorsPath": {
+            "type": "string",
+            "description": "Path to the errors in the API response",
+            "default": "QueryResult.Errors"
+        },
+        "query": {
+            "type": "string",
+            "description": "Rally query filter (e.g., '(State = \"In-Progress\") and (TechOwner contains \"Smith\")')"
+        },
+        "order": {
+            "type": "string",
+            "description": "Field to order by (e.g., 'WSJFScore', 'Name')"
+        },
+        "start": {
+            "type": "integer",
+            "description": "Start index for pagination (1-based)",
+            "default": 1
+        },
+        "pagesize": {
+            "type": "integer",
+            "description": "Number of items per page (max 200)",
+            "default": 20
+        },
+        "pages": {
+            "type": "integer",
+            "description": "Number of consecutive pages to fetch concurrently, starting at start (max 10)",
+            "default": 1
+        },
+        "fetch": {
+            "type": "string",
+            "description": "Comma-separated list of fields to fetch"
+        },
+        "workspace": {
+            "type": "string",
+            "description": "Workspace ID or reference"
+        },
+        "params": {
+            "type": "object",
+            "description": "Additional query parameters",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Rally query filter (e.g., '(State = \"In-Progress\") and (TechOwner contains \"Smith\")')"
+                },
+                "endpoint": {
+                    "type": "string",
+                    "description": "Rally API endpoint (default: portfolioitem/ppmfeature)",
+                    "default": "portfolioitem/ppmfeature"
+                },
+                "order": {
+                    "type": "string",
+                    "description": "Field to order by (e.g., 'WSJFScore', 'Name')"
+                },
+                "start": {
+                    "type": "integer",
+                    "description": "Start index for pagination (1-based)",
+                    "default": 1
+                },
+               "pagesize": {
+                    "type": "integer",
+                    "description": "Number of items per page (max 200)",
+                    "default": 20
+                },
+               "fetch": {
+                    "type": "string",
+                    "description": "Comma-separated list of fields to fetch"
+                },
+            }
+        }
+    },
+    "required": []
+}
+
+
 # https://rally1.rallydev.com/slm/webservice/v2.0/portfolioitem/ppmfeature?query=%28%28c_SHSQuadrimester+%3D+%222026+Quad+1%22%29+and+%28%28WSJFScore+%3E+0%29+and+%28TechOwner+contains+%22Tytar%22%29%29%29&order=WSJFScore&start=1&pagesize=40
 
 # /portfolioitem/ppmfeature
 
 class RallyAPITool(BaseFunctionToolFactory):
     """Tool for interacting with the Rally API."""
+
+    __slots__ = (
+        "_default_query", "_fetch_fields", "_endpoint_default", "_host", "_request_slots",
+        "_results_path", "_errors_path", "_get_results", "_get_errors"
+    )
+
     def __init__(self, name, description, **config):
         super().__init__(name, description, **config)
-
+        # Static config read once instead of on every request
+        self._default_query = config.get("defaultQuery")
+        self._fetch_fields = config.get("fetchFields")
+        self._endpoint_default = config.get("endpoint", "portfolioitem/ppmfeature")
+        self._host = config.get("host")
+        # Response paths are fixed per tool, so specialize their getters up front
+        self._results_path = config.get("resultsPath", _RESULTS_PATH)
+        self._errors_path = config.get("errorsPath", _ERRORS_PATH)
+        self._get_results = _compile_accessor(self._results_path)
+        self._get_errors = _compile_accessor(self._errors_path)
+        # Bounds in-flight requests so a looping agent queues instead of storming Rally
+        self._request_slots = asyncio.Semaphore(config.get("maxConcurrent", 16))
 
     def _collect_query_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Collect query parameters for the Rally API request."""
         query_params = {}
-        if self.config.get("fetchFields"):
-            query_params["fetch"] = self.config["fetchFields"]
+        if self._fetch_fields:
+            query_params["fetch"] = self._fetch_fields
             
         # Query filter
-        if params.get("query"):
-            if self.config.get("defaultQuery"):
-                query_params["query"] = f'({self.config.get("defaultQuery")} and {params.get("query")})'
+        query = params.get("query")
+        if query:
+            if self._default_query:
+                query_params["query"] = _wrap_query(self._default_query, query)
             else:
-                query_params["query"] = params["query"]
+                query_params["query"] = query
 
             # Ordering
             if params.get("order"):
@@ -49,42 +256,46 @@ class RallyAPITool(BaseFunctionToolFactory):
         if not data or not path:
             return default
             
-        try:
-            current = data
-            for key in path.split('.'):
-                if isinstance(current, dict) and key in current:
-                    current = current[key]
-                else:
-                    return default
-            return current
-        except (KeyError, TypeError, AttributeError):
-            return default
+        return _compile_accessor(path)(data, default)
 
     def generate_message_from_data(self, data):
         """Generate a message from the API response data."""
         if not data:
             return {"error": "No data available to generate message."}
         
-        results_path = self.config.get("resultsPath", "QueryResult.Results")
-        errors_path = self.config.get("errorsPath", "QueryResult.Errors")
+        results_path = self._results_path
+        errors_path = self._errors_path
+
+        # Rally-shaped responses: look QueryResult up once and read all fields from it
+        query_result = (data.get("QueryResult") or {}) if "QueryResult" in results_path else None
 
         # Use the helper function to extract data by path
-        results = self._get_nested_value(data, results_path, [])
-        errors = self._get_nested_value(data, errors_path, [])
-        isError = len(errors) > 0
+        if results_path == _RESULTS_PATH and isinstance(query_result, dict):
+            results = query_result.get("Results", [])
+        else:
+            results = self._get_results(data, [])
+        if errors_path == _ERRORS_PATH and isinstance(query_result, dict):
+            errors = query_result.get("Errors", [])
+        else:
+            errors = self._get_errors(data, [])
+        isError = bool(errors)
 
+        # Rally reports the total itself; otherwise count what the path returned
+        if query_result is not None:
+            total_result_count = query_result.get("TotalResultCount", 0)
+        else:
+            total_result_count = len(results) if isinstance(results, list) else 1
 
         # Extract relevant information from the data
         message = {
-            "total_result_count": len(results) if isinstance(results, list) else 1,
+            "total_result_count": total_result_count,
             "results": results,
             "success": not isError
         }
 
-        if "QueryResult" in results_path:
-            message["total_result_count"] = data.get("QueryResult", {}).get("TotalResultCount", 0)
-            message["start_index"] = data.get("QueryResult", {}).get("StartIndex", 1)
-            message["page_size"] = data.get("QueryResult", {}).get("PageSize", 0)
+        if query_result is not None:
+            message["start_index"] = query_result.get("StartIndex", 1)
+            message["page_size"] = query_result.get("PageSize", 0)
 
         if errors:
             message["errors"] = errors
@@ -93,10 +304,11 @@ class RallyAPITool(BaseFunctionToolFactory):
 
     async def _execute(self, params) -> Any:
         """Execute Rally API request to get portfolio items."""
+        # Check if aiohttp is available
+        if aiohttp is None:
+            return {"error": "aiohttp library is not installed. Please install it with: pip install aiohttp"}
+
         try:
-            import aiohttp
-            import urllib.parse
-            
             # Get API credentials from config
             api_key = self.config.get("api_key")
             
@@ -104,125 +316,104 @@ class RallyAPITool(BaseFunctionToolFactory):
                 return {"error": "Rally API credentials not configured. Need either api_key or username/password"}
             
             # Build the endpoint URL
-            endpoint = params.get("endpoint", self.config.get("endpoint", "portfolioitem/ppmfeature"))
-            url = f"{self.config.get('host')}{endpoint}"
+            endpoint = params.get("endpoint", self._endpoint_default)
+            url = f"{self._host}{endpoint}"
 
             # Build query parameters
             query_params = self._collect_query_params(params)
-            print(f"Rally API request: {url} with params: {query_params}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Rally API request: %s with params: %s", url, query_params)
             
             # Prepare authentication
             auth = None
-            headers = {"Content-Type": "application/json"}
+            headers = {}
             
             if api_key:
                 headers["Authorization"] = f'Bearer {api_key}'
             
-            # Make the API request
-            async with aiohttp.ClientSession() as session:
+            # Make the API request on the shared, connection-pooled session
+            session = get_session()
+            pages = min(max(int(params.get("pages", 1) or 1), 1), _MAX_PAGES)
+
+            if pages == 1:
                 query_params = query_params if len(query_params.keys()) > 0 else None
-                async with session.get(
-                    url, 
-                    params=query_params,
-                    headers=headers,
-                    auth=auth,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        message = self.generate_message_from_data(data)
-                        message["url"] = url
-                        return message
-                    else:
-                        error_text = await response.text()
-                        return {
-                            "error": f"Rally API request failed with status {response.status}",
-                            "status_code": response.status,
-                            "response": error_text,
-                            "url": url
-                        }
-                        
+                data, error = await self._fetch_page(session, url, query_params, headers, auth)
+                if error:
+                    return error
+                message = self.generate_message_from_data(data)
+                message["url"] = url
+                return message
+
+            # Several pages: request them all at once instead of one after another
+            page_size = query_params.get("pagesize", _DEFAULT_PAGE_SIZE)
+            first_start = query_params.get("start", 1)
+            page_params = [
+                {**query_params, "start": first_start + i * page_size, "pagesize": page_size}
+                for i in range(pages)
+            ]
+            fetched = await asyncio.gather(
+                *(self._fetch_page(session, url, qp, headers, auth) for qp in page_params)
+            )
+            for _, error in fetched:
+                if error:
+                    return error
+
+            return self._merge_page_messages(
+                [self.generate_message_from_data(data) for data, _ in fetched], url
+            )
+
+        except asyncio.TimeoutError:
+            return {"error": "Rally API request timed out", "timeout": True}
         except Exception as e:
             return {"error": f"Rally API request failed: {str(e)}"}
 
-    def get_schema(self) -> Dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "endpoint": {
-                    "type": "string",
-                    "description": "Rally API endpoint (default: portfolioitem/ppmfeature)",
-                    "default": "portfolioitem/ppmfeature"
-                },
-                "resultsPath": {
-                  "type": "string",
-                  "description": "Path to the result in the API response",
-                  "default": "QueryResult.Results"
-                },
-                "errorsPath": {
-                    "type": "string",
-                    "description": "Path to the errors in the API response",
-                    "default": "QueryResult.Errors"
-                },
-                "query": {
-                    "type": "string",
-                    "description": "Rally query filter (e.g., '(State = \"In-Progress\") and (TechOwner contains \"Smith\")')"
-                },
-                "order": {
-                    "type": "string",
-                    "description": "Field to order by (e.g., 'WSJFScore', 'Name')"
-                },
-                "start": {
-                    "type": "integer",
-                    "description": "Start index for pagination (1-based)",
-                    "default": 1
-                },
-                "pagesize": {
-                    "type": "integer",
-                    "description": "Number of items per page (max 200)",
-                    "default": 20
-                },
-                "fetch": {
-                    "type": "string",
-                    "description": "Comma-separated list of fields to fetch"
-                },
-                "workspace": {
-                    "type": "string",
-                    "description": "Workspace ID or reference"
-                },
-                "params": {
-                    "type": "object",
-                    "description": "Additional query parameters",
-                    "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "Rally query filter (e.g., '(State = \"In-Progress\") and (TechOwner contains \"Smith\")')"
-                        },
-                        "endpoint": {
-                            "type": "string",
-                            "description": "Rally API endpoint (default: portfolioitem/ppmfeature)",
-                            "default": "portfolioitem/ppmfeature"
-                        },
-                        "order": {
-                            "type": "string",
-                            "description": "Field to order by (e.g., 'WSJFScore', 'Name')"
-                        },
-                        "start": {
-                            "type": "integer",
-                            "description": "Start index for pagination (1-based)",
-                            "default": 1
-                        },
-                       "pagesize": {
-                            "type": "integer",
-                            "description": "Number of items per page (max 200)",
-                            "default": 20
-                        },
-                       "fetch": {
-                            "type": "string",
-                            "description": "Comma-separated list of fields to fetch"
-                        },
-                    }
+    async def _fetch_page(self, session, url, query_params, headers, auth):
+        """
+        Request one Rally page.
+        
+        Returns:
+            Tuple of (parsed JSON, None) on success, or (None, error dict) when
+            Rally answers with a non-200 status
+        """
+        async with self._request_slots:
+            async with session.get(
+                url, 
+                params=query_params,
+                headers=headers,
+                auth=auth
+            ) as response:
+                if response.status == 200:
+                    return _json_loads(await response.read()), None
+                error_text = await response.text()
+                return None, {
+                    "error": f"Rally API request failed with status {response.status}",
+                    "status_code": response.status,
+                    "response": error_text,
+                    "url": url
                 }
-            },
-            "required": []
-        }
+
+    def _merge_page_messages(self, messages: List[Dict[str, Any]], url: str) -> Dict[str, Any]:
+        """Combine per-page messages into one, with the results of all pages in order."""
+        merged = messages[0]
+        results = []
+        errors = []
+        for message in messages:
+            if "error" in message:
+                return message
+            page_results = message.get("results")
+            if isinstance(page_results, list):
+                results.extend(page_results)
+            elif page_results is not None:
+                results.append(page_results)
+            errors.extend(message.get("errors", []))
+
+        merged["results"] = results
+        merged["success"] = all(message.get("success") for message in messages)
+        merged["pages_fetched"] = len(messages)
+        if errors:
+            merged["errors"] = errors
+        merged["url"] = url
+        return merged
+
+    def get_schema(self) -> Dict[str, Any]:
+        return _RALLY_SCHEMA
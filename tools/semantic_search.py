@@ -1,10 +1,19 @@
 import os
+import array
 import asyncio
+import atexit
+import codecs
+import functools
+import hashlib
+import io
+import itertools
 import threading
 import logging
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Literal
+from typing import Dict, Any, List, Optional, Literal, Tuple
 from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pydantic import BaseModel, Field, model_validator
 import chromadb
 
@@ -30,10 +39,69 @@ class BaseEmbeddingProvider(ABC):
         pass
 
 
+# Texts encoded per forward pass when embedding documents; covers a whole
+# indexing batch in one pass
+_ENCODE_BATCH_SIZE = 128
+
+# Smallest embed_texts batch worth sending to CPU worker processes
+_MULTI_PROCESS_MIN_TEXTS = 64
+
+# Serializes model loads so concurrent providers never load the same weights twice
+_st_model_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=8)
+def _load_st_model(model_name: str):
+    """Load a SentenceTransformer model; cached so all providers share one copy."""
+    from sentence_transformers import SentenceTransformer
+    import torch
+
+    # Pick the device once, explicitly, instead of per encode call
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+
+    # Reduce HuggingFace Hub retries from default (unlimited) to 3
+    os.environ.setdefault('HF_HUB_DOWNLOAD_TIMEOUT', '30')
+    os.environ.setdefault('CURL_CA_BUNDLE', '')
+
+    # SentenceTransformer will respect HF_HUB_OFFLINE if network is unavailable
+    try:
+        model = SentenceTransformer(model_name, device=device)
+    except Exception as e:
+        # If download fails, try offline mode (use cached model)
+        os.environ['HF_HUB_OFFLINE'] = '1'
+        model = SentenceTransformer(model_name, device=device)
+
+    # Half precision halves GPU memory traffic; CPU inference stays FP32
+    if model.device.type == 'cuda':
+        model.half()
+    return model
+
+
+def _get_st_model(model_name: str):
+    """Return the shared SentenceTransformer model for a model name, loading it once."""
+    with _st_model_lock:
+        return _load_st_model(model_name)
+
+
+@functools.lru_cache(maxsize=8)
+def _start_st_pool(model_name: str, num_workers: int):
+    """Start CPU worker processes for a model; cached so all providers share one pool."""
+    model = _load_st_model(model_name)
+    pool = model.start_multi_process_pool(['cpu'] * num_workers)
+    atexit.register(model.stop_multi_process_pool, pool)
+    return pool
+
+
+def _get_st_pool(model_name: str, num_workers: int):
+    """Return the shared multi-process encoding pool for a model, starting it once."""
+    with _st_model_lock:
+        return _start_st_pool(model_name, num_workers)
+
+
 class HuggingFaceEmbeddingProvider(BaseEmbeddingProvider):
     """HuggingFace SentenceTransformer embedding provider."""
 
-    def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2', num_workers: int = 0):
         try:
             from sentence_transformers import SentenceTransformer
             self.SentenceTransformer = SentenceTransformer
@@ -43,35 +111,51 @@ class HuggingFaceEmbeddingProvider(BaseEmbeddingProvider):
                 "Install it with: pip install sentence-transformers"
             )
         self.model_name = model_name
+        self.num_workers = num_workers
         self._model = None
 
     @property
     def model(self):
-        """Lazy load the model only when first accessed."""
+        """Lazy load the model only when first accessed; shared across providers."""
+        # Unlocked fast path once resolved; the first access goes through the
+        # locked loader, which guarantees a single load process-wide
         if self._model is None:
-            import os
-            # Reduce HuggingFace Hub retries from default (unlimited) to 3
-            os.environ.setdefault('HF_HUB_DOWNLOAD_TIMEOUT', '30')
-            os.environ.setdefault('CURL_CA_BUNDLE', '')
-
-            # SentenceTransformer will respect HF_HUB_OFFLINE if network is unavailable
-            try:
-                self._model = self.SentenceTransformer(self.model_name)
-            except Exception as e:
-                # If download fails, try offline mode (use cached model)
-                os.environ['HF_HUB_OFFLINE'] = '1'
-                self._model = self.SentenceTransformer(self.model_name)
+            self._model = _get_st_model(self.model_name)
         return self._model
 
+    def _encode(self, texts: List[str], batch_size: int):
+        """Encode texts into a 2D numpy array of normalized embeddings."""
+        # Vectors are unit length, which leaves cosine distances unchanged
+        return self.model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for a list of texts."""
-        embeddings = self.model.encode(texts, convert_to_numpy=True)
-        return embeddings.tolist()
+        # Large batches on CPU are split across worker processes; query batches
+        # and GPU encoding stay in-process
+        if self.num_workers and len(texts) >= _MULTI_PROCESS_MIN_TEXTS and self.model.device.type == 'cpu':
+            pool = _get_st_pool(self.model_name, self.num_workers)
+            # Not normalized here; the collection uses cosine space, which is scale-invariant
+            return self.model.encode_multi_process(
+                texts,
+                pool,
+                batch_size=_ENCODE_BATCH_SIZE,
+                chunk_size=-(-len(texts) // self.num_workers)
+            ).tolist()
+        return self._encode(texts, _ENCODE_BATCH_SIZE).tolist()
 
     def embed_query(self, query: str) -> List[float]:
         """Generate embedding for a single query."""
-        embedding = self.model.encode([query], convert_to_numpy=True)
-        return embedding[0].tolist()
+        return self._encode([query], 1)[0].tolist()
+
+
+# Maximum number of texts per VertexAI get_embeddings request
+_VERTEXAI_MAX_BATCH_SIZE = 250
 
 
 class VertexAIGeminiEmbeddingProvider(BaseEmbeddingProvider):
@@ -98,8 +182,12 @@ class VertexAIGeminiEmbeddingProvider(BaseEmbeddingProvider):
 
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for a list of texts."""
-        embeddings = self.model.get_embeddings(texts)
-        return [emb.values for emb in embeddings]
+        # The API caps the number of texts per request
+        return [
+            emb.values
+            for start in range(0, len(texts), _VERTEXAI_MAX_BATCH_SIZE)
+            for emb in self.model.get_embeddings(texts[start:start + _VERTEXAI_MAX_BATCH_SIZE])
+        ]
 
     def embed_query(self, query: str) -> List[float]:
         """Generate embedding for a single query."""
@@ -107,6 +195,135 @@ class VertexAIGeminiEmbeddingProvider(BaseEmbeddingProvider):
         return embeddings[0].values
 
 
+class BatchingEmbedder:
+    """Coalesces concurrent query embeddings into batched embed_texts calls."""
+
+    def __init__(
+        self,
+        provider: BaseEmbeddingProvider,
+        max_batch_size: int = 32,
+        max_wait: float = 0.005,
+        cache_size: int = 4096
+    ):
+        """
+        Args:
+            provider: Embedding provider that computes the batches
+            max_batch_size: Maximum number of queries embedded in one call
+            max_wait: Seconds to wait for more queries after the first one arrives
+            cache_size: Number of recent query embeddings kept for exact repeats
+        """
+        self.provider = provider
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.cache_size = cache_size
+        # LRU of query -> embedding tuple; repeated queries skip the model entirely
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._loop = None
+        self._queue = None
+        self._worker = None
+
+    async def submit(self, query: str) -> List[float]:
+        """Embed a query, batched with any other queries submitted in the same window."""
+        cached = self._cache.get(query)
+        if cached is not None:
+            self._cache.move_to_end(query)
+            return list(cached)
+
+        loop = asyncio.get_running_loop()
+        # The queue and worker belong to the loop that started them
+        if self._loop is not loop or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+        future = loop.create_future()
+        self._queue.put_nowait((query, future))
+        embedding = await future
+
+        # Stored as a tuple so callers cannot alter the cached vector
+        self._cache[query] = tuple(embedding)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return embedding
+
+    async def _run(self):
+        """Drain queued queries in batches and resolve each caller's future."""
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                # Embedding blocks (model forward pass or RPC), so keep it off the loop
+                embeddings = await asyncio.to_thread(
+                    self.provider.embed_texts, [query for query, _ in batch]
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), embedding in zip(batch, embeddings):
+                # Callers that were cancelled meanwhile have a done future
+                if not future.done():
+                    future.set_result(embedding)
+
+
+# Seconds a search waits for running indexing before answering without it
+_INDEXING_READY_WAIT = 0.1
+
+# Distinct chunk texts whose embeddings are kept while indexing, so boilerplate
+# repeated across files (license headers, imports) is embedded once; vectors are
+# held as float32 arrays, about 30 MB for 768-dimensional embeddings
+_INDEX_EMBEDDING_CACHE_SIZE = 10000
+
+# Batches upserted concurrently when ChromaDB runs as a separate server
+_SERVER_MAX_PENDING_WRITES = 8
+
+# Leading bytes checked for NUL when telling binary files from text
+_BINARY_SNIFF_SIZE = 4096
+
+# Bytes read per step when streaming a file into chunks
+_STREAM_READ_SIZE = 64 * 1024
+
+# Applied to ChromaDB's SQLite connections before bulk indexing. WAL with
+# synchronous=NORMAL avoids an fsync per committed add while staying safe
+# against corruption; temp_store and a 256 MB page cache speed up index updates
+_SQLITE_BULK_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-262144",
+)
+
+
+def _tune_chroma_sqlite(client) -> None:
+    """
+    Apply _SQLITE_BULK_PRAGMAS to the calling thread's ChromaDB SQLite connection.
+    
+    ChromaDB keeps one connection per thread and has no public hook for
+    connection settings, so this reaches into its system registry. Failures
+    (other ChromaDB versions or backends) only cost performance and are ignored.
+    """
+    try:
+        from chromadb.db.impl.sqlite import SqliteDB
+        conn = client._system.instance(SqliteDB)._conn_pool.connect()
+        for pragma in _SQLITE_BULK_PRAGMAS:
+            conn.execute(pragma)
+    except Exception as e:
+        logging.getLogger(__name__).debug(f"Could not tune ChromaDB SQLite connection: {e}")
+
+
 # ============================================================================
 # Configuration Models
 # ============================================================================
@@ -134,6 +351,23 @@ class SemanticSearchConfig(BaseModel):
         le=500,
         description="Overlap between chunks (in characters)"
     )
+    chunk_boundary_window: int = Field(
+        default=64,
+        ge=0,
+        le=500,
+        description="Chunks end at the last newline within this many characters of chunk_size (0 cuts exactly at chunk_size)"
+    )
+    chroma_batch_size: int = Field(
+        default=250,
+        ge=50,
+        le=500,
+        description="Number of chunks embedded and added to ChromaDB per call while indexing (capped at the client's max_batch_size)"
+    )
+    max_file_bytes: int = Field(
+        default=2_000_000,
+        ge=1,
+        description="Files larger than this are not indexed (in bytes)"
+    )
 
     # Embedding provider configuration
     embedding_provider: Literal["huggingface", "vertexai"] = Field(
@@ -146,6 +380,12 @@ class SemanticSearchConfig(BaseModel):
         default="all-MiniLM-L6-v2",
         description="HuggingFace model name for embeddings"
     )
+    huggingface_num_workers: int = Field(
+        default=0,
+        ge=0,
+        le=32,
+        description="CPU worker processes for embedding while indexing (0 embeds in-process)"
+    )
 
     # VertexAI configuration (used when embedding_provider='vertexai')
     vertexai_model: str = Field(
@@ -161,6 +401,18 @@ class SemanticSearchConfig(BaseModel):
         description="GCP location/region for VertexAI"
     )
 
+    # ChromaDB server (if not set, an embedded database is kept in the scan directory)
+    chroma_server_host: Optional[str] = Field(
+        default=None,
+        description="Host of a ChromaDB server started with 'chroma run'"
+    )
+    chroma_server_port: int = Field(
+        default=8000,
+        ge=1,
+        le=65535,
+        description="Port of the ChromaDB server"
+    )
+
     # Default values for LLM parameters
     similarity_threshold: float = Field(
         default=0.3,
@@ -175,6 +427,13 @@ class SemanticSearchConfig(BaseModel):
         description="Default maximum number of search results to return"
     )
 
+    @model_validator(mode='after')
+    def _check_chunk_overlap(self):
+        # Each window starts chunk_overlap characters before the previous one ends
+        if self.chunk_overlap >= self.chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+        return self
+
     # LLM callable parameters definition
     params: List[ToolParam] = Field(
         default=[
@@ -199,6 +458,8 @@ class SemanticSearchTool(BaseFunctionToolFactory):
         super().__init__(name, description, **config)
         # Validate configuration using the static data model
         self.tool_config = self.data_model(**config)
+        # Lowercased once for O(1) suffix checks while scanning
+        self._extensions = frozenset(ext.lower() for ext in self.tool_config.file_extensions)
 
         # Setup logging
         self.logger = logging.getLogger(f"semantic_search_{name}")
@@ -207,10 +468,21 @@ class SemanticSearchTool(BaseFunctionToolFactory):
         # Initialize embedding provider based on configuration
         self.embedding_provider = self._create_embedding_provider()
         self.logger.info(f"Initialized {self.tool_config.embedding_provider} embedding provider")
-
-        # Initialize ChromaDB client - store in the scan directory
-        chroma_path = os.path.join(self.tool_config.scan_directory, f".chroma_db_{name}")
-        self.chroma_client = chromadb.PersistentClient(path=chroma_path)
+        # Concurrent searches share one embedding call per batch window
+        self._query_embedder = BatchingEmbedder(self.embedding_provider)
+
+        # Initialize ChromaDB client - a server if configured, else stored in the scan directory
+        if self.tool_config.chroma_server_host:
+            self.chroma_client = chromadb.HttpClient(
+                host=self.tool_config.chroma_server_host,
+                port=self.tool_config.chroma_server_port
+            )
+            # The server handles concurrent writes, so several batches may be in flight
+            self._max_pending_writes = _SERVER_MAX_PENDING_WRITES
+        else:
+            chroma_path = os.path.join(self.tool_config.scan_directory, f".chroma_db_{name}")
+            self.chroma_client = chromadb.PersistentClient(path=chroma_path)
+            self._max_pending_writes = 1
 
         # Get or create collection
         self.collection = self.chroma_client.get_or_create_collection(
@@ -218,9 +490,10 @@ class SemanticSearchTool(BaseFunctionToolFactory):
             metadata={"hnsw:space": "cosine"}
         )
 
-        # Track indexing state
-        self._indexing_complete = False
-        self._indexing_lock = threading.Lock()
+        # Set by the background indexing thread once the index is complete
+        self._indexing_ready = threading.Event()
+        # Set when the background indexing thread exits, whether or not it succeeded
+        self._indexing_finished = threading.Event()
 
         # Start background indexing
         self._start_background_indexing()
@@ -231,7 +504,8 @@ class SemanticSearchTool(BaseFunctionToolFactory):
 
         if provider_type == "huggingface":
             return HuggingFaceEmbeddingProvider(
-                model_name=self.tool_config.huggingface_model
+                model_name=self.tool_config.huggingface_model,
+                num_workers=self.tool_config.huggingface_num_workers
             )
         elif provider_type == "vertexai":
             return VertexAIGeminiEmbeddingProvider(
@@ -257,7 +531,9 @@ class SemanticSearchTool(BaseFunctionToolFactory):
                 import traceback
                 self.logger.error(f"Traceback: {traceback.format_exc()}")
                 # Mark as complete even on failure to avoid infinite waiting
-                self._indexing_complete = True
+                self._indexing_ready.set()
+            finally:
+                self._indexing_finished.set()
 
         indexing_thread = threading.Thread(target=index_worker, daemon=True)
         indexing_thread.start()
@@ -265,128 +541,363 @@ class SemanticSearchTool(BaseFunctionToolFactory):
 
     def _index_directory(self):
         """Index files in the configured directory."""
-        with self._indexing_lock:
-            if self._indexing_complete:
-                return
-
-            self.logger.info(f"Starting indexing of directory: {self.tool_config.scan_directory}")
-
-            scan_path = Path(self.tool_config.scan_directory)
-            if not scan_path.exists():
-                self.logger.error(f"Directory does not exist: {self.tool_config.scan_directory}")
-                self._indexing_complete = True  # Mark as complete to avoid infinite retries
-                return
-
-            documents = []
-            metadatas = []
-            ids = []
-            doc_id = 0
-            files_processed = 0
-
-            # Scan files (one level deep as requested)
-            for file_path in scan_path.iterdir():
-                if file_path.is_file() and file_path.suffix.lower() in self.tool_config.file_extensions:
-                    try:
-                        before_count = len(documents)
-                        self._process_file(file_path, documents, metadatas, ids, doc_id)
-                        chunks_added = len(documents) - before_count
-                        doc_id += chunks_added
-                        files_processed += 1
-                        self.logger.debug(f"Processed {file_path.name}: {chunks_added} chunks")
-                    except Exception as e:
-                        self.logger.warning(f"Failed to process file {file_path}: {e}")
-                elif file_path.is_dir():
-                    # One level of depth - scan subdirectories
-                    for sub_file in file_path.iterdir():
-                        if sub_file.is_file() and sub_file.suffix.lower() in self.tool_config.file_extensions:
-                            try:
-                                before_count = len(documents)
-                                self._process_file(sub_file, documents, metadatas, ids, doc_id)
-                                chunks_added = len(documents) - before_count
-                                doc_id += chunks_added
-                                files_processed += 1
-                                self.logger.debug(f"Processed {sub_file}: {chunks_added} chunks")
-                            except Exception as e:
-                                self.logger.warning(f"Failed to process file {sub_file}: {e}")
-
-            self.logger.info(f"Scanned {files_processed} files, found {len(documents)} document chunks")
-
-            # Add documents to ChromaDB in batches with embeddings
-            if documents:
-                try:
-                    batch_size = 100
-                    for i in range(0, len(documents), batch_size):
-                        batch_docs = documents[i:i + batch_size]
-                        batch_metas = metadatas[i:i + batch_size]
-                        batch_ids = ids[i:i + batch_size]
-
-                        # Generate embeddings for this batch
-                        batch_embeddings = self.embedding_provider.embed_texts(batch_docs)
-
-                        self.collection.add(
-                            documents=batch_docs,
-                            metadatas=batch_metas,
-                            ids=batch_ids,
-                            embeddings=batch_embeddings
-                        )
-                        self.logger.debug(f"Added batch {i//batch_size + 1}: {len(batch_docs)} chunks")
-
-                    self.logger.info(f"Successfully indexed {len(documents)} document chunks")
-                except Exception as e:
-                    self.logger.error(f"Failed to add documents to ChromaDB: {e}")
-                    import traceback
-                    self.logger.error(f"Traceback: {traceback.format_exc()}")
-                    return  # Don't mark as complete if indexing failed
-            else:
-                self.logger.info("No documents found to index")
+        if self._indexing_ready.is_set():
+            return
 
-            self._indexing_complete = True
-            self.logger.info("Indexing completed successfully")
+        self.logger.info(f"Starting indexing of directory: {self.tool_config.scan_directory}")
 
-    def _process_file(self, file_path: Path, documents: List[str], metadatas: List[Dict], ids: List[str], doc_id: int):
-        """Process a single file and add chunks to the document list."""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except UnicodeDecodeError:
-            # Skip binary files
+        scan_path = Path(self.tool_config.scan_directory)
+        if not scan_path.exists():
+            self.logger.error(f"Directory does not exist: {self.tool_config.scan_directory}")
+            self._indexing_ready.set()  # Mark as complete to avoid infinite retries
             return
 
-        # Split content into chunks
-        chunks = self._chunk_text(content)
-
-        for i, chunk in enumerate(chunks):
-            if chunk.strip():  # Skip empty chunks
-                documents.append(chunk)
-                metadatas.append({
-                    "file_path": str(file_path),
-                    "file_name": file_path.name,
-                    "chunk_index": i,
-                    "file_extension": file_path.suffix
-                })
-                ids.append(f"{doc_id}_{i}")
-
-    def _chunk_text(self, text: str) -> List[str]:
-        """Split text into overlapping chunks."""
-        chunks = []
-        chunk_size = self.tool_config.chunk_size
-        overlap = self.tool_config.chunk_overlap
+        file_paths = self._scan_files(scan_path)
+        stats = {"files": 0, "chunks": 0}
+        # Filled by _iter_chunks: unchanged files whose metadata only needs
+        # refreshing, and ids of chunks that no longer exist
+        refreshes = []
+        obsolete_ids = []
+
+        # Files indexed by an earlier run with the same size, mtime and chunking
+        # are skipped; entries left over afterwards belong to deleted files
+        index_state = self._load_index_state()
+        chunk_config = self._chunk_config()
+        changed = []
+        unchanged = 0
+        for file_path in file_paths:
+            entry = index_state.pop(str(file_path), None)
+            if entry is not None and self._is_entry_fresh(entry, file_path, chunk_config):
+                unchanged += 1
+            else:
+                changed.append((file_path, entry))
+        for entry in index_state.values():
+            obsolete_ids.extend(entry["ids"])
+        self.logger.info(f"{unchanged} files unchanged since last indexing, {len(changed)} to index")
+
+        # Chunks stream from the readers into fixed-size embedding batches, so
+        # only a bounded read-ahead of text is held in memory at any time
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        # Writer threads add batch N to ChromaDB while batch N+1 is being embedded;
+        # at most _max_pending_writes adds are in flight, which bounds memory
+        max_pending_writes = self._max_pending_writes
+        # Records per ChromaDB call; the SQLite backend rejects larger writes
+        max_batch_size = self._chroma_max_batch_size()
+        upsert_batch_size = min(self.tool_config.chroma_batch_size, max_batch_size)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor, \
+                ThreadPoolExecutor(max_workers=max_pending_writes) as writer:
+            if not self.tool_config.chroma_server_host:
+                # Connections are per thread: tune both the one used for get/update/delete
+                # here and the writer's one used for upserts
+                _tune_chroma_sqlite(self.chroma_client)
+                writer.submit(_tune_chroma_sqlite, self.chroma_client)
+            chunk_stream = self._iter_chunks(
+                changed, executor, max_workers * 2, stats, refreshes, obsolete_ids
+            )
+            try:
+                batch_number = 0
+                pending_adds = deque()
+                embedding_cache = OrderedDict()
+                while True:
+                    batch = list(itertools.islice(chunk_stream, upsert_batch_size))
+                    if not batch:
+                        break
+                    batch_docs, batch_metas, batch_ids = (list(column) for column in zip(*batch))
+
+                    # Generate embeddings for this batch
+                    batch_embeddings = self._embed_documents(batch_docs, embedding_cache)
+
+                    if len(pending_adds) >= max_pending_writes:
+                        pending_adds.popleft().result()
+                    batch_number += 1
+                    # Upsert: a changed file reuses its chunk ids
+                    pending_adds.append(writer.submit(
+                        self.collection.upsert,
+                        documents=batch_docs,
+                        metadatas=batch_metas,
+                        ids=batch_ids,
+                        embeddings=batch_embeddings
+                    ))
+
+                while pending_adds:
+                    pending_adds.popleft().result()
+                self.logger.debug(f"Added {batch_number} batches")
+
+                for refresh_ids, refresh_metadatas in refreshes:
+                    for start in range(0, len(refresh_ids), max_batch_size):
+                        self.collection.update(
+                            ids=refresh_ids[start:start + max_batch_size],
+                            metadatas=refresh_metadatas[start:start + max_batch_size]
+                        )
+                if obsolete_ids:
+                    for start in range(0, len(obsolete_ids), max_batch_size):
+                        self.collection.delete(ids=obsolete_ids[start:start + max_batch_size])
+                    self.logger.info(f"Removed {len(obsolete_ids)} obsolete document chunks")
+            except Exception as e:
+                self.logger.error(f"Failed to add documents to ChromaDB: {e}")
+                import traceback
+                self.logger.error(f"Traceback: {traceback.format_exc()}")
+                return  # Don't mark as complete if indexing failed
+            finally:
+                chunk_stream.close()
+
+        self.logger.info(f"Scanned {stats['files']} files, found {stats['chunks']} document chunks")
+        if stats["chunks"]:
+            self.logger.info(f"Successfully indexed {stats['chunks']} document chunks")
+        else:
+            self.logger.info("No documents found to index")
+
+        self._indexing_ready.set()
+        self.logger.info("Indexing completed successfully")
+
+    def _scan_files(self, scan_path: Path) -> List[Path]:
+        """List indexable files in the scan directory and its direct subdirectories."""
+        extensions = self._extensions
+        file_paths = []
+
+        # os.walk classifies entries from the directory read (scandir), so file
+        # names come without a per-entry stat; followlinks keeps symlinked
+        # subdirectories scanned
+        for root, dirs, files in os.walk(scan_path, followlinks=True):
+            if root != str(scan_path):
+                dirs.clear()  # One level of depth
+            file_paths.extend(
+                Path(root, file_name)
+                for file_name in files
+                if os.path.splitext(file_name)[1].lower() in extensions
+            )
 
-        if len(text) <= chunk_size:
-            return [text]
+        return file_paths
+
+    def _embed_documents(self, documents: List[str], cache: OrderedDict) -> List[List[float]]:
+        """
+        Embed documents, computing each distinct text only once.
+        
+        Args:
+            documents: Chunk texts to embed
+            cache: LRU of text digest -> float32 embedding array, shared across the batches of one run
+            
+        Returns:
+            One embedding per document, in order
+        """
+        keys = [hashlib.blake2b(doc.encode('utf-8'), digest_size=16).digest() for doc in documents]
+        missing = {}
+        for key, doc in zip(keys, documents):
+            if key in cache:
+                cache.move_to_end(key)
+            elif key not in missing:
+                missing[key] = doc
+
+        if missing:
+            embeddings = self.embedding_provider.embed_texts(list(missing.values()))
+            cache.update(
+                (key, array.array('f', embedding)) for key, embedding in zip(missing, embeddings)
+            )
 
-        start = 0
-        while start < len(text):
-            end = start + chunk_size
-            chunk = text[start:end]
-            chunks.append(chunk)
+        # Expand to float lists only for the batch being upserted
+        embeddings = [cache[key].tolist() for key in keys]
+        while len(cache) > _INDEX_EMBEDDING_CACHE_SIZE:
+            cache.popitem(last=False)
+        return embeddings
+
+    def _chroma_max_batch_size(self) -> int:
+        """Most records ChromaDB accepts in one write; clients before 0.4.10 do not report it."""
+        return getattr(self.chroma_client, "max_batch_size", None) or self.tool_config.chroma_batch_size
+
+    def _chunk_config(self) -> str:
+        """Chunking parameters stored with each chunk; changing them forces re-indexing."""
+        config = self.tool_config
+        return f"{config.chunk_size}:{config.chunk_overlap}:{config.chunk_boundary_window}"
+
+    def _load_index_state(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Group the chunks already in the collection by source file.
+        
+        Returns:
+            Dict of file path -> {"ids": chunk ids, "metadata": metadata of one chunk}
+        """
+        existing = self.collection.get(include=["metadatas"])
+        index_state = {}
+        for chunk_id, metadata in zip(existing["ids"], existing["metadatas"]):
+            file_path = (metadata or {}).get("file_path")
+            entry = index_state.setdefault(file_path, {"ids": [], "metadata": metadata or {}})
+            entry["ids"].append(chunk_id)
+        return index_state
+
+    @staticmethod
+    def _is_entry_fresh(entry: Dict[str, Any], file_path: Path, chunk_config: str) -> bool:
+        """Whether an indexed file still matches the file on disk (size, mtime and chunking)."""
+        metadata = entry["metadata"]
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
+            return False
+        return (
+            metadata.get("file_mtime_ns") == file_stat.st_mtime_ns
+            and metadata.get("file_size") == file_stat.st_size
+            and metadata.get("chunk_config") == chunk_config
+        )
 
-            if end >= len(text):
-                break
+    def _iter_chunks(
+        self,
+        files: List[Tuple[Path, Optional[Dict[str, Any]]]],
+        executor: ThreadPoolExecutor,
+        read_ahead: int,
+        stats: Dict[str, int],
+        refreshes: List[Tuple[List[str], List[Dict]]],
+        obsolete_ids: List[str]
+    ):
+        """
+        Yield (document, metadata, id) triples for the given files in scan order.
+        
+        Files are read and chunked on the executor, at most read_ahead at a time.
+        Chunk ids hash the file path, chunk index and text, so chunks already in
+        the previous index entry are not re-embedded; only their metadata is
+        queued for refreshing.
+        
+        Args:
+            files: (file path, previous index entry or None) pairs, in scan order
+            executor: Executor that runs _read_and_chunk
+            read_ahead: Maximum number of files being read or waiting to be consumed
+            stats: Counters updated with processed "files" and emitted "chunks"
+            refreshes: Receives (ids, metadatas) of unchanged chunks with new file info
+            obsolete_ids: Receives ids of previously indexed chunks that no longer exist
+        """
+        items = iter(files)
+        pending = deque(
+            (file_path, entry, executor.submit(self._read_and_chunk, file_path))
+            for file_path, entry in itertools.islice(items, read_ahead)
+        )
+
+        while pending:
+            file_path, entry, future = pending.popleft()
+            next_item = next(items, None)
+            if next_item is not None:
+                next_path, next_entry = next_item
+                pending.append((next_path, next_entry, executor.submit(self._read_and_chunk, next_path)))
 
-            start = end - overlap
+            try:
+                chunks, chunk_metadatas = future.result()
+            except Exception as e:
+                self.logger.warning(f"Failed to process file {file_path}: {e}")
+                continue
+            stats["files"] += 1
+
+            path_key = f"{file_path}\0"
+            chunk_ids = [
+                hashlib.sha1(f"{path_key}{metadata['chunk_index']}\0{chunk}".encode('utf-8')).hexdigest()[:16]
+                for chunk, metadata in zip(chunks, chunk_metadatas)
+            ]
+
+            new_chunks = list(zip(chunks, chunk_metadatas, chunk_ids))
+            if entry is not None:
+                old_ids = set(entry["ids"])
+                obsolete_ids.extend(old_ids.difference(chunk_ids))
+                kept = [(chunk_id, metadata) for chunk_id, metadata in zip(chunk_ids, chunk_metadatas)
+                        if chunk_id in old_ids]
+                if kept:
+                    # Same text at the same position: keep the embedding, refresh the file info
+                    kept_ids, kept_metadatas = (list(column) for column in zip(*kept))
+                    refreshes.append((kept_ids, kept_metadatas))
+                    new_chunks = [item for item in new_chunks if item[2] not in old_ids]
+
+            stats["chunks"] += len(new_chunks)
+            self.logger.debug(f"Processed {file_path}: {len(chunks)} chunks, {len(new_chunks)} new")
+            yield from new_chunks
+
+    def _read_and_chunk(self, file_path: Path) -> Tuple[List[str], List[Dict]]:
+        """Read a single file and split it into chunks with their metadata."""
+        file_stat = os.stat(file_path)
+        if file_stat.st_size > self.tool_config.max_file_bytes:
+            self.logger.debug(f"Skipping {file_path}: {file_stat.st_size} bytes exceeds max_file_bytes")
+            return [], []
+
+        digest = hashlib.sha256()
+        documents = []
+        chunk_indexes = []
+        with open(file_path, 'rb') as f:
+            # Skip binary files: a NUL byte near the start rules out text
+            if b'\x00' in f.read(_BINARY_SNIFF_SIZE):
+                return [], []
+            f.seek(0)
+            for chunk, i in self._chunk_file_stream(f, digest):
+                if chunk.strip():  # Skip empty chunks
+                    documents.append(chunk)
+                    chunk_indexes.append(i)
+
+        # Identifies this version of the file for incremental re-indexing
+        file_info = {
+            "file_mtime_ns": file_stat.st_mtime_ns,
+            "file_size": file_stat.st_size,
+            "file_sha256": digest.hexdigest(),
+            "chunk_config": self._chunk_config()
+        }
+        metadatas = [
+            {
+                "file_path": str(file_path),
+                "file_name": file_path.name,
+                "chunk_index": i,
+                "file_extension": file_path.suffix,
+                **file_info
+            }
+            for i in chunk_indexes
+        ]
+
+        return documents, metadatas
+
+    def _chunk_file_stream(self, f, digest):
+        """
+        Split a binary file into overlapping text chunks while reading it.
+        
+        The file is read and decoded in _STREAM_READ_SIZE blocks with text-mode
+        newline translation (invalid UTF-8 becomes U+FFFD), so only the current
+        block and the unfinished window are held in memory.
+        
+        Each chunk is at most chunk_size characters and the next one starts
+        chunk_overlap characters before its end. A chunk that is not the last
+        one ends after the last newline within chunk_boundary_window characters
+        of its full size, if there is one. With a window of 0 this is plain
+        slicing every (chunk_size - overlap) characters.
+        
+        Args:
+            f: File opened in binary mode
+            digest: Hash object updated with the raw bytes read
+            
+        Yields:
+            (chunk, chunk_index) tuples
+        """
+        chunk_size = self.tool_config.chunk_size
+        overlap = self.tool_config.chunk_overlap
+        boundary_window = self.tool_config.chunk_boundary_window
+        decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(errors='replace'), translate=True)
+
+        buf = ""
+        chunk_index = 0
+        while True:
+            block = f.read(_STREAM_READ_SIZE)
+            digest.update(block)
+            buf += decoder.decode(block, final=not block)
+
+            # Only windows with text after them are cut here; the last one is the tail
+            start = 0
+            while len(buf) - start > chunk_size:
+                end = start + chunk_size
+                if boundary_window:
+                    # Never back off into the overlap, so every window advances
+                    newline = buf.rfind('\n', max(end - boundary_window, start + overlap), end)
+                    if newline != -1:
+                        end = newline + 1
+                yield buf[start:end], chunk_index
+                chunk_index += 1
+                start = end - overlap
+            buf = buf[start:]
+
+            if not block:
+                break
 
-        return chunks
+        # The tail always extends past the previous window; for a text no longer
+        # than one chunk it is the whole text
+        yield buf, chunk_index
 
     async def _execute(self, params) -> Any:
         """Search the semantic index."""
@@ -399,10 +910,11 @@ class SemanticSearchTool(BaseFunctionToolFactory):
         similarity_threshold = params.get("similarity_threshold", self.tool_config.similarity_threshold)
 
         try:
-            # Check if indexing is complete or if we have data in collection (fallback)
-            collection_count = self.collection.count()
-
-            if not self._indexing_complete and collection_count == 0:
+            # While indexing, give it a moment to finish, then fall back to searching
+            # whatever an earlier run already stored in the collection
+            if not self._indexing_finished.is_set():
+                await asyncio.to_thread(self._indexing_finished.wait, _INDEXING_READY_WAIT)
+            if not self._indexing_ready.is_set() and self.collection.count() == 0:
                 # Actually still indexing
                 scan_path = Path(self.tool_config.scan_directory)
                 files_in_dir = list(scan_path.glob("*")) if scan_path.exists() else []
@@ -411,21 +923,17 @@ class SemanticSearchTool(BaseFunctionToolFactory):
                     "message": "Search index is still being built. Please try again in a moment.",
                     "query": query,
                     "debug_info": {
-                        "indexing_complete": self._indexing_complete,
-                        "collection_count": collection_count,
+                        "indexing_complete": self._indexing_ready.is_set(),
+                        "collection_count": 0,
                         "scan_directory": str(scan_path),
                         "directory_exists": scan_path.exists(),
                         "files_in_directory": [str(f) for f in files_in_dir[:5]],
                         "supported_extensions": self.tool_config.file_extensions
                     }
                 }
-            elif not self._indexing_complete and collection_count > 0:
-                # Indexing completed but flag wasn't set - fix it
-                self.logger.info(f"Indexing appears complete ({collection_count} documents), fixing completion flag")
-                self._indexing_complete = True
 
             # Generate query embedding
-            query_embedding = self.embedding_provider.embed_query(query)
+            query_embedding = await self._query_embedder.submit(query)
 
             # Perform semantic search
             results = self.collection.query(
@@ -438,24 +946,23 @@ class SemanticSearchTool(BaseFunctionToolFactory):
             search_results = []
             all_similarities = []
             if results['documents'] and results['documents'][0]:
-                for i, (doc, metadata, distance) in enumerate(zip(
-                    results['documents'][0],
-                    results['metadatas'][0],
-                    results['distances'][0]
-                )):
-                    # Convert distance to similarity score (ChromaDB uses cosine distance)
-                    similarity = 1 - distance
-                    all_similarities.append(round(similarity, 4))
-
-                    if similarity >= similarity_threshold:
-                        search_results.append({
-                            "content": doc,
-                            "similarity_score": round(similarity, 4),
-                            "file_path": metadata.get("file_path"),
-                            "file_name": metadata.get("file_name"),
-                            "chunk_index": metadata.get("chunk_index"),
-                            "file_extension": metadata.get("file_extension")
-                        })
+                # Convert distance to similarity score (ChromaDB uses cosine distance)
+                distances = results['distances'][0]
+                all_similarities = [round(1 - distance, 4) for distance in distances]
+                search_results = [
+                    {
+                        "content": doc,
+                        "similarity_score": score,
+                        "file_path": metadata.get("file_path"),
+                        "file_name": metadata.get("file_name"),
+                        "chunk_index": metadata.get("chunk_index"),
+                        "file_extension": metadata.get("file_extension")
+                    }
+                    for doc, metadata, distance, score in zip(
+                        results['documents'][0], results['metadatas'][0], distances, all_similarities
+                    )
+                    if 1 - distance >= similarity_threshold
+                ]
 
             return {
                 "status": "success",
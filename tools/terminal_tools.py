@@ -1,26 +1,107 @@
-import subprocess
+import asyncio
+import functools
+import os
 import shlex
 import re
-from typing import Dict, Any, List, Optional
-from pathlib import Path
+import stat
+from typing import Dict, Any, Optional, Tuple
 
 from core.tool_creation.tool_factories import BaseFunctionToolFactory
 
 
+# Bytes read from a command's output pipe per call
+_READ_SIZE = 64 * 1024
+
+# Template placeholders like {param_name}
+_PLACEHOLDER_RE = re.compile(r'\{(\w+)\}')
+
+# Shell metacharacters rejected in SafeTerminalTool parameters, plus the literal
+# two-character sequences \n and \r
+_DANGEROUS_RE = re.compile(r'[;&|`$()<>]|\\[nr]')
+
+
+# Placeholders that str.format_map treats as a plain key lookup
+_FORMAT_FIELD_RE = re.compile(r'\{([^\W\d]\w*)\}')
+
+# Placeholders such as {1} that str.format would read as positional fields
+_POSITIONAL_FIELD_RE = re.compile(r'\{\d\w*\}')
+
+
+@functools.lru_cache(maxsize=256)
+def _to_format_string(template: str) -> Optional[str]:
+    """
+    Escape every brace except {name} placeholders so a command template is safe for str.format_map.
+    
+    Returns None for templates with digit-led placeholders, which format_map cannot fill.
+    """
+    if _POSITIONAL_FIELD_RE.search(template):
+        return None
+    parts = _FORMAT_FIELD_RE.split(template)
+    # split() alternates literal text and placeholder names
+    parts[::2] = [part.replace('{', '{{').replace('}', '}}') for part in parts[::2]]
+    parts[1::2] = ['{' + name + '}' for name in parts[1::2]]
+    return ''.join(parts)
+
+
+class _QuotedParams(dict):
+    """Mapping for str.format_map: values come out shell-quoted, unknown keys stay placeholders."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if dict.__contains__(self, key):
+            return shlex.quote(str(dict.__getitem__(self, key)))
+        return '{' + key + '}'
+
+
+@functools.lru_cache(maxsize=64)
+def _allowed_dir_prefixes(allowed_dirs: Tuple[str, ...], cwd: str) -> Tuple[str, ...]:
+    """
+    Resolve configured working directory roots into separator-terminated prefixes.
+    
+    Relative roots such as the default "." depend on the process working
+    directory, which is part of the cache key so a chdir resolves them again.
+    """
+    return tuple(_dir_prefix(allowed_dir) for allowed_dir in allowed_dirs)
+
+
+def _dir_prefix(path: str) -> str:
+    """Real, case-normalized path ending in a separator, so "/a/b" never matches "/a/bc"."""
+    return os.path.join(os.path.normcase(os.path.realpath(path)), '')
+
+
 class TerminalCommandTool(BaseFunctionToolFactory):
     """Tool for executing terminal commands with security restrictions."""
     
+    __slots__ = (
+        "_exact_commands", "_command_prefixes", "_command_templates", "_fixed_command",
+        "_max_execution_time", "_allowed_working_dirs", "_capture_output", "_max_output_size",
+        "_config_working_dir", "_schema"
+    )
+
+    def __init__(self, name, description, **config):
+        super().__init__(name, description, **config)
+        # Static config read once instead of on every call
+        allowed_commands = config.get("allowed_commands", [])  # List of allowed commands
+        # Entries ending in "*" are prefix matches ("*" alone allows everything)
+        self._exact_commands = frozenset(allowed for allowed in allowed_commands if not allowed.endswith("*"))
+        self._command_prefixes = tuple(allowed[:-1] for allowed in allowed_commands if allowed.endswith("*"))
+        self._command_templates = config.get("command_templates", {})  # Pre-defined command templates
+        self._fixed_command = config.get("command", None)  # Single fixed command template
+        self._max_execution_time = config.get("max_execution_time", 30)  # Timeout in seconds
+        # Allowed working directories, resolved once
+        self._allowed_working_dirs = tuple(config.get("allowed_working_dirs", []))
+        self._capture_output = config.get("capture_output", True)  # Whether to capture output
+        self._max_output_size = config.get("max_output_size", 10000)  # Max characters in output
+        self._config_working_dir = config.get("working_dir", None)  # Fixed working directory from config
+        # The schema depends only on the config above, so it is built once
+        self._schema = self._build_schema()
+    
     async def _execute(self, params) -> Any:
         """Execute terminal command with safety checks."""
-        # Configuration options
-        allowed_commands = self.config.get("allowed_commands", [])  # List of allowed commands
-        command_templates = self.config.get("command_templates", {})  # Pre-defined command templates
-        fixed_command = self.config.get("command", None)  # Single fixed command template
-        max_execution_time = self.config.get("max_execution_time", 30)  # Timeout in seconds
-        allowed_working_dirs = self.config.get("allowed_working_dirs", [])  # Allowed working directories
-        capture_output = self.config.get("capture_output", True)  # Whether to capture output
-        max_output_size = self.config.get("max_output_size", 10000)  # Max characters in output
-        config_working_dir = self.config.get("working_dir", None)  # Fixed working directory from config
+        fixed_command = self._fixed_command
+        command_templates = self._command_templates
+        config_working_dir = self._config_working_dir
 
         try:
             command = params.get("command")
@@ -48,30 +129,31 @@ class TerminalCommandTool(BaseFunctionToolFactory):
                 
             elif command:
                 # Use direct command if allowed (only if no fixed_command is set)
-                if not self._is_command_allowed(command, allowed_commands):
+                if not self._is_command_allowed(command):
                     return {"error": f"Command not allowed: {command}"}
             else:
                 return {"error": "Either 'command' or 'template_name' must be provided"}
 
             # Validate working directory
-            if allowed_working_dirs and not self._is_working_dir_allowed(working_dir, allowed_working_dirs):
+            if self._allowed_working_dirs and not self._is_working_dir_allowed(working_dir, self._allowed_working_dirs):
                 return {"error": f"Working directory not allowed: {working_dir}"}
 
-            # Validate working directory exists
-            work_dir_path = Path(working_dir)
-            if not work_dir_path.exists():
+            # Validate working directory exists, with a single stat
+            try:
+                work_dir_stat = os.stat(working_dir)
+            except OSError:
                 return {"error": f"Working directory does not exist: {working_dir}"}
             
-            if not work_dir_path.is_dir():
+            if not stat.S_ISDIR(work_dir_stat.st_mode):
                 return {"error": f"Working directory is not a directory: {working_dir}"}
 
             # Execute command
             result = await self._execute_command(
                 command,
                 working_dir, 
-                max_execution_time, 
-                capture_output,
-                max_output_size
+                self._max_execution_time, 
+                self._capture_output,
+                self._max_output_size
             )
             
             return result
@@ -81,57 +163,43 @@ class TerminalCommandTool(BaseFunctionToolFactory):
 
     def _replace_placeholders(self, template: str, params: Dict[str, Any]) -> str:
         """Replace placeholders in command template with actual values."""
-        command = template
-        
-        # Replace placeholders like {param_name} with actual values
-        for key, value in params.items():
-            placeholder = f"{{{key}}}"
-            if placeholder in command:
-                # Escape shell special characters in the value
-                escaped_value = shlex.quote(str(value))
-                command = command.replace(placeholder, escaped_value)
-        
-        return command
+        # Replace placeholders like {param_name} with shell-escaped values in one
+        # C-level format pass; other braces in the template are escaped once per template
+        format_string = _to_format_string(template)
+        if format_string is not None:
+            return format_string.format_map(_QuotedParams(params))
 
-    def _is_command_allowed(self, command: str, allowed_commands: List[str]) -> bool:
+        def replace(match):
+            key = match.group(1)
+            if key not in params:
+                return match.group(0)
+            # Escape shell special characters in the value
+            return shlex.quote(str(params[key]))
+
+        return _PLACEHOLDER_RE.sub(replace, template)
+
+    def _is_command_allowed(self, command: str) -> bool:
         """Check if a command is in the allowed list."""
-        if not allowed_commands:
-            return False  # If no allowed commands specified, nothing is allowed
-        
-        # Extract the base command (first word)
-        base_command = command.split()[0] if command.split() else ""
+        # Extract the base command (first word); maxsplit stops at the first token
+        words = command.split(maxsplit=1)
+        base_command = words[0] if words else ""
         
-        for allowed in allowed_commands:
-            # Support wildcards and exact matches
-            if allowed == "*":  # Allow all commands (dangerous!)
-                return True
-            elif allowed == base_command:  # Exact command match
-                return True
-            elif allowed.endswith("*") and base_command.startswith(allowed[:-1]):  # Prefix match
-                return True
-        
-        return False
+        # Exact command match or prefix match; "*" is the empty prefix and allows
+        # all commands (dangerous!). With no allowed commands nothing matches
+        return base_command in self._exact_commands or base_command.startswith(self._command_prefixes)
 
-    def _is_working_dir_allowed(self, working_dir: str, allowed_dirs: List[str]) -> bool:
-        """Check if working directory is allowed."""
+    def _is_working_dir_allowed(self, working_dir: str, allowed_dirs: Tuple[str, ...]) -> bool:
+        """Check if working directory is within one of the allowed directories."""
         if not allowed_dirs:
             return True  # If no restrictions, allow all
         
-        work_path = Path(working_dir).resolve()
-        
-        for allowed_dir in allowed_dirs:
-            allowed_path = Path(allowed_dir).resolve()
-            try:
-                # Check if working_dir is within allowed directory
-                work_path.relative_to(allowed_path)
-                return True
-            except ValueError:
-                continue
-        
-        return False
+        # The allowed roots are resolved once per process working directory; realpath
+        # on both sides keeps symlinks from escaping the allowed directories
+        return _dir_prefix(working_dir).startswith(_allowed_dir_prefixes(allowed_dirs, os.getcwd()))
 
+    @classmethod
     async def _execute_command(
-        self, 
+        cls, 
         command: str, 
         working_dir: str, 
         timeout: int, 
@@ -140,23 +208,25 @@ class TerminalCommandTool(BaseFunctionToolFactory):
     ) -> Dict[str, Any]:
         """Execute the command and return results."""
         try:
-            # Use shell=True for complex commands, but be careful with security
-            process = subprocess.Popen(
+            # Run through the shell for complex commands, but be careful with security;
+            # the event loop keeps serving other tool calls while the command runs
+            process = await asyncio.create_subprocess_shell(
                 command,
-                shell=True,
                 cwd=working_dir,
-                stdout=subprocess.PIPE if capture_output else None,
-                stderr=subprocess.PIPE if capture_output else None,
-                text=True,
-                universal_newlines=True
+                stdout=asyncio.subprocess.PIPE if capture_output else None,
+                stderr=asyncio.subprocess.PIPE if capture_output else None
             )
             
-            # Wait for completion with timeout
+            # Wait for completion with timeout, keeping at most enough bytes for
+            # max_output_size characters (up to 4 bytes each in UTF-8)
             try:
-                stdout, stderr = process.communicate(timeout=timeout)
-            except subprocess.TimeoutExpired:
+                (stdout_bytes, stdout_discarded), (stderr_bytes, stderr_discarded) = await asyncio.wait_for(
+                    cls._communicate_capped(process, 4 * max_output_size + 4),
+                    timeout=timeout
+                )
+            except asyncio.TimeoutError:
                 process.kill()
-                stdout, stderr = process.communicate()
+                await process.communicate()
                 return {
                     "command": command,
                     "working_dir": working_dir,
@@ -167,11 +237,8 @@ class TerminalCommandTool(BaseFunctionToolFactory):
                 }
             
             # Truncate output if too long
-            if stdout and len(stdout) > max_output_size:
-                stdout = stdout[:max_output_size] + f"\n... (output truncated at {max_output_size} characters)"
-            
-            if stderr and len(stderr) > max_output_size:
-                stderr = stderr[:max_output_size] + f"\n... (output truncated at {max_output_size} characters)"
+            stdout = cls._decode_output(stdout_bytes, stdout_discarded, max_output_size)
+            stderr = cls._decode_output(stderr_bytes, stderr_discarded, max_output_size)
             
             return {
                 "command": command,
@@ -192,10 +259,70 @@ class TerminalCommandTool(BaseFunctionToolFactory):
                 "error": f"Failed to execute command: {str(e)}"
             }
 
+    @classmethod
+    async def _communicate_capped(
+        cls,
+        process: asyncio.subprocess.Process,
+        max_bytes: int
+    ) -> Tuple[Tuple[bytes, int], Tuple[bytes, int]]:
+        """Wait for the process, keeping at most max_bytes of stdout and of stderr."""
+        stdout, stderr = await asyncio.gather(
+            cls._read_capped(process.stdout, max_bytes),
+            cls._read_capped(process.stderr, max_bytes)
+        )
+        await process.wait()
+        return stdout, stderr
+
+    @staticmethod
+    async def _read_capped(stream: Optional[asyncio.StreamReader], max_bytes: int) -> Tuple[bytes, int]:
+        """
+        Read a pipe to EOF, keeping only its first max_bytes.
+        
+        The rest is read and discarded so the child never blocks on a full pipe
+        (or gets SIGPIPE); memory stays bounded by max_bytes plus one read.
+        
+        Returns:
+            Tuple of (kept bytes, number of bytes discarded)
+        """
+        if stream is None:
+            return b"", 0
+        kept = bytearray()
+        discarded = 0
+        while True:
+            data = await stream.read(_READ_SIZE)
+            if not data:
+                return bytes(kept), discarded
+            room = max_bytes - len(kept)
+            if len(data) > room:
+                kept += data[:room]
+                discarded += len(data) - room
+            else:
+                kept += data
+
+    @staticmethod
+    def _decode_output(data: bytes, discarded: int, max_output_size: int) -> str:
+        """Decode captured output as UTF-8 text with universal newlines, truncated to max_output_size."""
+        if not data:
+            return ""
+        text = data.decode('utf-8', 'replace')
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        if discarded:
+            text = (
+                text[:max_output_size]
+                + f"\n... (output truncated at {max_output_size} characters, {discarded} further bytes discarded)"
+            )
+        elif len(text) > max_output_size:
+            text = text[:max_output_size] + f"\n... (output truncated at {max_output_size} characters)"
+        return text
+
     def get_schema(self) -> Dict[str, Any]:
+        return self._schema
+
+    def _build_schema(self) -> Dict[str, Any]:
         # Check if working_dir is fixed in config
-        config_working_dir = self.config.get("working_dir", None)
-        fixed_command = self.config.get("command", None)
+        config_working_dir = self._config_working_dir
+        fixed_command = self._fixed_command
         
         schema = {
             "type": "object",
@@ -246,15 +373,30 @@ class TerminalCommandTool(BaseFunctionToolFactory):
 class SafeTerminalTool(BaseFunctionToolFactory):
     """A more restrictive terminal tool that only allows predefined commands."""
     
+    __slots__ = (
+        "_command_templates", "_fixed_command", "_max_execution_time", "_allowed_working_dirs",
+        "_max_output_size", "_config_working_dir", "_schema"
+    )
+
+    def __init__(self, name, description, **config):
+        super().__init__(name, description, **config)
+        # Static config read once instead of on every call; this tool only works
+        # with predefined command templates for maximum security
+        self._command_templates = config.get("command_templates", {})
+        self._fixed_command = config.get("command", None)  # Single fixed command template
+        self._max_execution_time = config.get("max_execution_time", 10)
+        # Allowed working directories, resolved once
+        self._allowed_working_dirs = tuple(config.get("allowed_working_dirs", ["."]))
+        self._max_output_size = config.get("max_output_size", 5000)
+        self._config_working_dir = config.get("working_dir", None)  # Fixed working directory from config
+        # The schema depends only on the config above, so it is built once
+        self._schema = self._build_schema()
+    
     async def _execute(self, params) -> Any:
         """Execute only predefined safe commands."""
-        # This tool only works with predefined command templates for maximum security
-        command_templates = self.config.get("command_templates", {})
-        fixed_command = self.config.get("command", None)  # Single fixed command template
-        max_execution_time = self.config.get("max_execution_time", 10)
-        allowed_working_dirs = self.config.get("allowed_working_dirs", ["."])
-        max_output_size = self.config.get("max_output_size", 5000)
-        config_working_dir = self.config.get("working_dir", None)  # Fixed working directory from config
+        command_templates = self._command_templates
+        fixed_command = self._fixed_command
+        config_working_dir = self._config_working_dir
 
         try:
             template_name = params.get("template_name")
@@ -290,22 +432,16 @@ class SafeTerminalTool(BaseFunctionToolFactory):
                 return {"error": "Either fixed command must be configured or template_name must be provided"}
             
             # Validate working directory
-            if not self._is_working_dir_allowed(working_dir, allowed_working_dirs):
+            if not self._is_working_dir_allowed(working_dir, self._allowed_working_dirs):
                 return {"error": f"Working directory not allowed: {working_dir}"}
 
-            # Execute command
-            terminal_tool = TerminalCommandTool(
-                name="internal_terminal",
-                description="Internal terminal tool",
-                **self.config
-            )
-            
-            result = await terminal_tool._execute_command(
+            # Execute command; the runner holds no per-tool state, so no inner tool is built
+            result = await TerminalCommandTool._execute_command(
                 command,
                 working_dir,
-                max_execution_time,
+                self._max_execution_time,
                 True,
-                max_output_size
+                self._max_output_size
             )
             
             # Add template info to result
@@ -322,54 +458,43 @@ class SafeTerminalTool(BaseFunctionToolFactory):
 
     def _replace_placeholders_safe(self, template: str, params: Dict[str, Any]) -> str:
         """Safely replace placeholders with validation."""
-        command = template
-        
-        # Find all placeholders in template
-        placeholders = re.findall(r'\{(\w+)\}', template)
-        
-        for placeholder in placeholders:
+        def replace(match):
+            placeholder = match.group(1)
             if placeholder not in params:
                 raise ValueError(f"Missing required parameter: {placeholder}")
             
-            value = params[placeholder]
+            value = str(params[placeholder])
             
             # Basic validation - no shell injection characters
-            if self._contains_dangerous_chars(str(value)):
+            if self._contains_dangerous_chars(value):
                 raise ValueError(f"Parameter '{placeholder}' contains potentially dangerous characters")
             
-            # Replace placeholder
-            escaped_value = shlex.quote(str(value))
-            command = command.replace(f"{{{placeholder}}}", escaped_value)
-        
-        return command
+            return shlex.quote(value)
+
+        # Validate and replace every placeholder in one pass over the template
+        return _PLACEHOLDER_RE.sub(replace, template)
 
     def _contains_dangerous_chars(self, value: str) -> bool:
         """Check if value contains potentially dangerous shell characters."""
-        dangerous_chars = [';', '&', '|', '`', '$', '(', ')', '<', '>', '\\n', '\\r']
-        return any(char in value for char in dangerous_chars)
+        # One C-level scan instead of a substring search per character
+        return _DANGEROUS_RE.search(value) is not None
 
-    def _is_working_dir_allowed(self, working_dir: str, allowed_dirs: List[str]) -> bool:
-        """Check if working directory is allowed."""
+    def _is_working_dir_allowed(self, working_dir: str, allowed_dirs: Tuple[str, ...]) -> bool:
+        """Check if working directory is within one of the allowed directories."""
         if not allowed_dirs:
             return False  # Require explicit allowlist
         
-        work_path = Path(working_dir).resolve()
-        
-        for allowed_dir in allowed_dirs:
-            allowed_path = Path(allowed_dir).resolve()
-            try:
-                # Check if working_dir is within allowed directory
-                work_path.relative_to(allowed_path)
-                return True
-            except ValueError:
-                continue
-        
-        return False
+        # The allowed roots are resolved once per process working directory; realpath
+        # on both sides keeps symlinks from escaping the allowed directories
+        return _dir_prefix(working_dir).startswith(_allowed_dir_prefixes(allowed_dirs, os.getcwd()))
 
     def get_schema(self) -> Dict[str, Any]:
+        return self._schema
+
+    def _build_schema(self) -> Dict[str, Any]:
         # Check if working_dir is fixed in config
-        config_working_dir = self.config.get("working_dir", None)
-        fixed_command = self.config.get("command", None)
+        config_working_dir = self._config_working_dir
+        fixed_command = self._fixed_command
         
         schema = {
             "type": "object",